@@ -0,0 +1,275 @@
+"""以多個無介面 Blender 程序批次處理 .blend 檔案
+
+協調程序以一般 Python 執行，將檔案分派給 --jobs 個 `blender -b` 工作程序（預設為 CPU 核心數），
+每個檔案完成後輸出一行 JSON（進度、耗時與各操作的結果）。檔案先儲存到同資料夾的暫存檔，
+成功後才以 os.replace 取代原檔；沒有任何變更的檔案不會重新儲存。
+
+操作以 JSON 陣列指定，依序套用到檔案中每個網格物件（連結的函式庫資料除外）：
+    {"op": "delete_empty_groups"}
+    {"op": "clean_weights", "max_influences": 4, "epsilon": 0.001, "quantize_bits": 0,
+     "normalize": true, "remove_empty": true}
+    {"op": "select_axis", "x_axis": true, "y_axis": false, "z_axis": false,
+     "direction": "POSITIVE", "coord_mode": "LOCAL",
+     "then": {"op": "set_weight", "group": "Arm.L", "weight": 1.0, "mirror_axis": null}}
+    {"op": "select_axis", "x_axis": true, "direction": "NEGATIVE", "then": {"op": "delete"}}
+
+用法：
+    python batch/run.py 資產資料夾 其他.blend --ops '[{"op": "delete_empty_groups"}]' [--jobs 8]
+        [--blender blender] [--output 記錄.jsonl] [--timeout 600] [--dry-run]
+    python batch/run.py --files 檔案清單.txt --ops 操作.json
+"""
+import argparse
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+# 與效能測試腳本共用命令列參數處理，工作程序也由此匯入附加元件套件
+sys.path.insert(0, str(ROOT))
+from benchmarks.common import script_args
+
+# 工作程序以此前綴輸出結果，與 Blender 本身的訊息區分
+RESULT_PREFIX = "BATCH_RESULT "
+
+
+def load_ops(spec):
+    """--ops 可為 JSON 字串或 JSON 檔案路徑"""
+    path = pathlib.Path(spec)
+    text = path.read_text(encoding="utf-8") if path.is_file() else spec
+    ops = json.loads(text)
+    return ops if isinstance(ops, list) else [ops]
+
+
+def collect_files(paths, file_list):
+    """展開資料夾（遞迴尋找 .blend）並加入檔案清單中的路徑，保持順序並去除重複"""
+    candidates = []
+    if file_list:
+        lines = pathlib.Path(file_list).read_text(encoding="utf-8").splitlines()
+        candidates.extend(line.strip() for line in lines if line.strip())
+    candidates.extend(paths)
+
+    files = []
+    for candidate in map(pathlib.Path, candidates):
+        if candidate.is_dir():
+            files.extend(sorted(candidate.rglob("*.blend")))
+        else:
+            files.append(candidate)
+    return list(dict.fromkeys(path.resolve() for path in files))
+
+
+# 工作程序（在 Blender 內執行）
+def process_mesh_ops(modules, obj, ops, processed_data):
+    """對單一網格物件套用所有操作，回傳每個操作的結果"""
+    weight_tool, select_tool = modules
+    results = []
+    for position, op in enumerate(ops):
+        name = op["op"]
+        start = time.perf_counter()
+        result = {"op": name}
+        # 權重與選取都存放在網格資料上，共用網格的物件（連結複製）每個操作只處理一次；
+        # 以操作的位置區分，同一清單中出現兩次的同名操作各自套用
+        data_key = (position, name, obj.data)
+
+        if name == "delete_empty_groups":
+            removed = weight_tool.remove_empty_vertex_groups(obj, keep_locked=op.get("keep_locked", False))
+            result["removed_groups"] = removed
+            result["changed"] = bool(removed)
+
+        elif name == "clean_weights":
+            if data_key in processed_data:
+                continue
+            processed_data.add(data_key)
+            locked = [vg.lock_weight for vg in obj.vertex_groups]
+            snapshot, stats = weight_tool.clean_weights(
+                weight_tool.read_weights(obj), locked,
+                op.get("max_influences", 4), op.get("epsilon", 0.001),
+                op.get("quantize_bits", 0), op.get("normalize", True),
+            )
+            written, removed = weight_tool.write_weights(obj, snapshot)
+            result.update(stats, written=written, removed=removed)
+            if op.get("remove_empty", True):
+                result["removed_groups"] = weight_tool.remove_empty_vertex_groups(obj, keep_locked=True)
+            result["changed"] = bool(written or removed or result.get("removed_groups"))
+
+        elif name == "select_axis":
+            # 刪除頂點會重複作用在同一個網格上，全域座標模式下各物件的矩陣也不同
+            if data_key in processed_data:
+                continue
+            processed_data.add(data_key)
+            axis_flags = (op.get("x_axis", True), op.get("y_axis", False), op.get("z_axis", False))
+            query = select_tool.axis_query(axis_flags, op.get("direction", "POSITIVE") == "POSITIVE")
+            matrix = obj.matrix_world if op.get("coord_mode", "LOCAL") == "GLOBAL" else None
+            selected = select_tool.select_mesh_region(obj.data, query, matrix)
+            result["selected"] = selected
+            result["changed"] = False
+            follow = op.get("then")
+            if follow and selected:
+                result["then"] = follow_up(weight_tool, obj, follow)
+                result["changed"] = result["then"]["changed"]
+
+        else:
+            raise ValueError(f"未知的操作: {name}")
+
+        result["elapsed_s"] = time.perf_counter() - start
+        results.append(result)
+    return results
+
+
+def follow_up(weight_tool, obj, op):
+    """依軸向選取之後對選取頂點執行的操作"""
+    name = op["op"]
+    if name == "set_weight":
+        vertex_groups = obj.vertex_groups
+        group = vertex_groups.get(op["group"]) or vertex_groups.new(name=op["group"])
+        count, mirrored = weight_tool.set_vertex_weight(
+            obj, group.index, op.get("weight", 1.0),
+            mirror_axis=op.get("mirror_axis"), mirror_tolerance=op.get("mirror_tolerance", 1e-4),
+        )
+        return {"op": name, "vertices": count, "mirrored": mirrored, "changed": True}
+    if name == "delete":
+        import bmesh
+
+        bm = bmesh.new()
+        bm.from_mesh(obj.data)
+        verts = [vert for vert in bm.verts if vert.select]
+        bmesh.ops.delete(bm, geom=verts, context='VERTS')
+        bm.to_mesh(obj.data)
+        bm.free()
+        weight_tool.invalidate_weights(obj)
+        return {"op": name, "vertices": len(verts), "changed": bool(verts)}
+    raise ValueError(f"未知的後續操作: {name}")
+
+
+def save_atomic(bpy, path):
+    """先儲存到同資料夾的暫存檔，成功後才取代原檔（相對路徑仍然有效）"""
+    path = pathlib.Path(path)
+    temp = path.with_name(f".{path.stem}.{os.getpid()}.tmp.blend")
+    try:
+        # 未指定 compress 時沿用原檔的壓縮設定
+        bpy.ops.wm.save_as_mainfile(filepath=str(temp), copy=True)
+        os.replace(temp, path)
+    finally:
+        if temp.exists():
+            temp.unlink()
+
+
+def run_worker(ops, dry_run):
+    import importlib
+
+    import bpy
+
+    modules = (importlib.import_module("頂點工具.群組工具"), importlib.import_module("頂點工具.選取工具"))
+
+    result = {"file": bpy.data.filepath, "status": "ok", "objects": {}}
+    start = time.perf_counter()
+    try:
+        if bpy.context.object is not None and bpy.context.object.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        processed_data = set()
+        changed = False
+        for obj in bpy.data.objects:
+            if obj.type != 'MESH' or obj.library is not None or obj.data.library is not None:
+                continue
+            obj_results = process_mesh_ops(modules, obj, ops, processed_data)
+            result["objects"][obj.name] = obj_results
+            changed = changed or any(item["changed"] for item in obj_results)
+
+        result["changed"] = changed
+        if changed and not dry_run:
+            save_start = time.perf_counter()
+            save_atomic(bpy, bpy.data.filepath)
+            result["save_s"] = time.perf_counter() - save_start
+        result["saved"] = changed and not dry_run
+    except Exception:
+        result["status"] = "error"
+        result["error"] = traceback.format_exc()
+    result["process_s"] = time.perf_counter() - start
+    print(RESULT_PREFIX + json.dumps(result, ensure_ascii=False, default=str), flush=True)
+
+
+# 協調程序
+def run_file(blender, path, ops_json, dry_run, timeout):
+    """啟動一個 Blender 工作程序處理單一檔案，回傳結果"""
+    command = [blender, "-b", "--factory-startup", str(path), "--python", str(pathlib.Path(__file__).resolve()),
+               "--", "--worker", "--ops", ops_json]
+    if dry_run:
+        command.append("--dry-run")
+    start = time.perf_counter()
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, encoding="utf-8",
+                                   errors="replace", timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"file": str(path), "status": "timeout", "elapsed_s": time.perf_counter() - start}
+
+    result = None
+    for line in completed.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            result = json.loads(line[len(RESULT_PREFIX):])
+    if result is None:
+        # 檔案無法開啟或 Blender 異常結束時沒有結果
+        result = {"status": "error", "returncode": completed.returncode,
+                  "error": (completed.stderr or completed.stdout)[-2000:]}
+    result["file"] = str(path)
+    result["elapsed_s"] = time.perf_counter() - start
+    return result
+
+
+def run_batch(files, ops, blender, jobs, dry_run, timeout, output):
+    ops_json = json.dumps(ops, ensure_ascii=False)
+
+    def emit(record):
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+
+    start = time.perf_counter()
+    emit({"event": "start", "files": len(files), "jobs": jobs, "ops": ops})
+    failures = 0
+    # 每個執行緒只負責等待一個 Blender 子程序，實際工作在各自的程序中平行進行
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run_file, blender, path, ops_json, dry_run, timeout) for path in files]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            failures += result["status"] != "ok"
+            emit(dict(result, event="file", done=done, total=len(files)))
+    emit({"event": "finish", "files": len(files), "failures": failures,
+          "elapsed_s": time.perf_counter() - start})
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="以無介面 Blender 批次處理 .blend 檔案")
+    parser.add_argument("paths", nargs="*", help=".blend 檔案或資料夾")
+    parser.add_argument("--files", help="每行一個路徑的檔案清單")
+    parser.add_argument("--ops", required=True, help="操作的 JSON 字串或 JSON 檔案")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender 執行檔")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="同時執行的 Blender 程序數")
+    parser.add_argument("--timeout", type=float, default=None, help="單一檔案的逾時秒數")
+    parser.add_argument("--output", help="JSON Lines 記錄檔，預設輸出到標準輸出")
+    parser.add_argument("--dry-run", action="store_true", help="只執行操作不儲存")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(script_args())
+
+    ops = load_ops(args.ops)
+    if args.worker:
+        run_worker(ops, args.dry_run)
+        return 0
+
+    files = collect_files(args.paths, args.files)
+    if not files:
+        parser.error("沒有找到任何 .blend 檔案")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            return run_batch(files, ops, args.blender, max(1, args.jobs), args.dry_run, args.timeout, output)
+    return run_batch(files, ops, args.blender, max(1, args.jobs), args.dry_run, args.timeout, sys.stdout)
+
+
+if __name__ == "__main__":
+    status = main()
+    if status:
+        sys.exit(status)
@@ -0,0 +1,50 @@
+"""效能測試與批次處理腳本共用的輔助函數
+
+bpy 只在需要時才匯入，協調程序可以用一般 Python 匯入本模組。
+"""
+import importlib
+import pathlib
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+# 讓附加元件套件可以直接從儲存庫匯入
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def script_args():
+    """blender 執行時取 -- 之後的參數，直接以 python 執行時取全部參數"""
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+    # 在 blender 內執行時 bpy 已預先載入，其餘參數屬於 blender 本身
+    return [] if "bpy" in sys.modules else sys.argv[1:]
+
+
+def load_addon():
+    """從儲存庫匯入並註冊頂點工具套件，各工具為其子模組（例如 package.選取工具）"""
+    package = importlib.import_module("頂點工具")
+    package.register()
+    return package
+
+
+def clear_scene():
+    """回到物件模式並刪除場景中所有物件"""
+    import bpy
+
+    if bpy.context.object and bpy.context.object.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+
+
+def timed(func, *args, repeat=3, setup=None):
+    """執行 repeat 次並回傳最短耗時（秒），setup 會在每次計時前呼叫"""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -0,0 +1,148 @@
+"""啟用附加元件的耗時：匯入並註冊頂點工具套件，可與合併為套件之前的單檔附加元件比較
+
+每次量測都啟動新的無介面 Blender 程序（模組匯入後會被快取，同一程序內重複量測沒有意義），
+記錄從匯入到 register() 完成的耗時，以及註冊後 NumPy 是否已被載入。
+
+--baseline-ref 指定合併前的提交時，會以 git archive 取出該版本根目錄的 .py 附加元件，
+並以同樣的方式逐一匯入與註冊作為比較基準。
+
+用法：
+    python benchmarks/register_time.py [--blender blender] [--repeat 5] [--baseline-ref 提交] [--output 結果.json]
+"""
+import argparse
+import importlib
+import io
+import json
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+from common import script_args
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+PACKAGE = "頂點工具"
+# 工作程序以此前綴輸出結果，與 Blender 本身的訊息區分
+RESULT_PREFIX = "REGISTER_TIME "
+
+
+# 工作程序（在 Blender 內執行）
+def register_package(path):
+    """目前的做法：整個套件是一個附加元件"""
+    sys.path.insert(0, str(path))
+    importlib.import_module(PACKAGE).register()
+    return [PACKAGE]
+
+
+def register_files(path):
+    """合併前的做法：每個含 bl_info 的 .py 檔各自是一個附加元件"""
+    sys.path.insert(0, str(path))
+    names = []
+    for file in sorted(path.glob("*.py")):
+        module = importlib.import_module(file.stem)
+        if hasattr(module, "bl_info"):
+            module.register()
+            names.append(file.stem)
+    return names
+
+
+def run_worker(layout, path):
+    numpy_preloaded = "numpy" in sys.modules
+    start = time.perf_counter()
+    names = (register_package if layout == "package" else register_files)(pathlib.Path(path))
+    elapsed = time.perf_counter() - start
+    result = {
+        "layout": layout,
+        "addons": names,
+        "register_s": elapsed,
+        "numpy_preloaded": numpy_preloaded,
+        "numpy_loaded": "numpy" in sys.modules,
+    }
+    print(RESULT_PREFIX + json.dumps(result, ensure_ascii=False), flush=True)
+
+
+# 協調程序
+def measure(blender, layout, path, repeat):
+    """啟動 repeat 個 Blender 程序量測同一種版面，回傳彙總結果"""
+    command = [blender, "-b", "--factory-startup", "--python", str(pathlib.Path(__file__).resolve()),
+               "--", "--worker", layout, str(path)]
+    results = []
+    for _ in range(repeat):
+        completed = subprocess.run(command, capture_output=True, text=True, encoding="utf-8", errors="replace")
+        lines = [line for line in completed.stdout.splitlines() if line.startswith(RESULT_PREFIX)]
+        if not lines:
+            raise RuntimeError(f"Blender 沒有輸出結果:\n{(completed.stderr or completed.stdout)[-2000:]}")
+        results.append(json.loads(lines[-1][len(RESULT_PREFIX):]))
+
+    times = [result["register_s"] for result in results]
+    return {
+        "layout": layout,
+        "addons": results[0]["addons"],
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "numpy_preloaded": results[0]["numpy_preloaded"],
+        "numpy_loaded": any(result["numpy_loaded"] for result in results),
+    }
+
+
+def extract_baseline(ref, directory):
+    """將 ref 版本根目錄的 .py 檔案取出到 directory，回傳檔案數"""
+    archive = subprocess.run(["git", "-C", str(ROOT), "archive", "--format=tar", ref],
+                             capture_output=True, check=True).stdout
+    count = 0
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        for member in tar.getmembers():
+            if member.isfile() and "/" not in member.name and member.name.endswith(".py"):
+                (directory / member.name).write_bytes(tar.extractfile(member).read())
+                count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="頂點工具啟用（匯入與註冊）耗時")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender 執行檔")
+    parser.add_argument("--repeat", type=int, default=5, help="每種版面啟動的 Blender 程序數")
+    parser.add_argument("--baseline-ref", help="作為比較基準的提交（根目錄為單檔附加元件的版本）")
+    parser.add_argument("--output", help="結果 JSON 檔案路徑")
+    parser.add_argument("--worker", nargs=2, metavar=("LAYOUT", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args(script_args())
+
+    if args.worker:
+        run_worker(*args.worker)
+        return 0
+
+    repeat = max(1, args.repeat)
+    reports = [measure(args.blender, "package", ROOT, repeat)]
+    if args.baseline_ref:
+        with tempfile.TemporaryDirectory() as directory:
+            if not extract_baseline(args.baseline_ref, pathlib.Path(directory)):
+                parser.error(f"{args.baseline_ref} 的根目錄沒有 .py 檔案")
+            baseline = measure(args.blender, "files", directory, repeat)
+        baseline["ref"] = args.baseline_ref
+        reports.append(baseline)
+
+    print(f"{'版面':<10} {'附加元件數':>8} {'最短 (ms)':>10} {'中位數 (ms)':>12} {'註冊後已載入 NumPy':>18}")
+    for report in reports:
+        name = "套件" if report["layout"] == "package" else f"單檔 {report['ref']}"
+        numpy_state = "啟動時已載入" if report["numpy_preloaded"] else ("是" if report["numpy_loaded"] else "否")
+        print(f"{name:<10} {len(report['addons']):>8} {report['min_s'] * 1000:>10.2f} "
+              f"{report['median_s'] * 1000:>12.2f} {numpy_state:>18}")
+    if len(reports) == 2:
+        difference = reports[0]["median_s"] - reports[1]["median_s"]
+        print(f"中位數差異: {difference * 1000:+.2f} ms")
+
+    if args.output:
+        text = json.dumps(reports, ensure_ascii=False, indent=2)
+        pathlib.Path(args.output).write_text(text, encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    status = main()
+    if status:
+        sys.exit(status)
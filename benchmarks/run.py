@@ -0,0 +1,334 @@
+"""頂點工具各元件的無介面效能測試
+
+在程序產生的網格、曲線與骨架場景上計時各運算符與面板 draw()，
+結果（耗時與記憶體峰值）輸出為 JSON，並可比較兩次結果找出效能退步。
+
+用法：
+    blender -b --factory-startup --python benchmarks/run.py -- [--scale quick|full] [--repeat 3] [--output 結果.json]
+    python benchmarks/run.py [--scale quick|full] ...          # 使用 pip 安裝的 bpy 模組
+    python benchmarks/run.py --compare 基準.json 目前.json [--threshold 0.15]
+"""
+import argparse
+import datetime
+import json
+import pathlib
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+from common import clear_scene, load_addon, script_args
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SCALES = {
+    "quick": {
+        "mesh_verts": [10_000],
+        "group_counts": [1, 20],
+        "group_mesh_verts": 10_000,
+        "curve_points": 10_000,
+        "bones": 1_000,
+    },
+    "full": {
+        "mesh_verts": [10_000, 100_000, 1_000_000, 5_000_000],
+        "group_counts": [1, 50, 500],
+        "group_mesh_verts": 300_000,
+        "curve_points": 100_000,
+        "bones": 10_000,
+    },
+}
+
+# 每條曲線的控制點數
+POINTS_PER_SPLINE = 1_000
+# 每個頂點的影響群組數
+INFLUENCES = 4
+
+
+# 計時與記憶體量測
+def peak_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None
+
+
+def measure(run, repeat, before=None):
+    """計時 repeat 次後，再額外執行一次量測 Python 配置的記憶體峰值"""
+    times = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    if before is not None:
+        before()
+    tracemalloc.start()
+    run()
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "runs_s": times,
+        "py_peak_bytes": py_peak,
+        "max_rss_kb": peak_rss_kb(),
+    }
+
+
+class NullLayout:
+    """面板 draw() 用的空版面，所有呼叫都回傳自身，只量測資料存取的成本"""
+
+    def __getattr__(self, name):
+        return self
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+    def __setattr__(self, name, value):
+        pass
+
+
+def run_cases(scale_name, repeat):
+    import bpy
+
+    scale = SCALES[scale_name]
+    package = load_addon()
+    coordinate_tool = package.座標工具
+    weight_tool = package.群組工具
+    results = []
+
+    def record(name, run, before=None, **params):
+        result = measure(run, repeat, before)
+        result.update(name=name, params=params)
+        results.append(result)
+        print(f"{name:<48} {result['min_s'] * 1000:>10.2f} ms", flush=True)
+
+    def activate(obj, mode):
+        bpy.context.view_layer.objects.active = obj
+        obj.select_set(True)
+        if obj.mode != mode:
+            bpy.ops.object.mode_set(mode=mode)
+
+    def draw_panel(panel_cls):
+        panel_cls.draw(SimpleNamespace(layout=NullLayout()), bpy.context)
+
+    def select_by_axis(obj):
+        with bpy.context.temp_override(objects_in_mode=[obj]):
+            bpy.ops.object.select_vertices_by_axis(x_axis=True, direction='POSITIVE', coord_mode='GLOBAL')
+
+    def coordinate_cases(obj, kind, **params):
+        scene = bpy.context.scene
+        reset = package.資料存取._on_reset
+        scene.clipboard_mode = 'SINGLE'
+        record(f"panel_draw/coordinates/{kind}/cold", lambda: draw_panel(coordinate_tool.CopyPasteCoordinatesPanel),
+               before=reset, **params)
+        record(f"panel_draw/coordinates/{kind}/warm", lambda: draw_panel(coordinate_tool.CopyPasteCoordinatesPanel),
+               **params)
+        record(f"copy_coordinates/{kind}", bpy.ops.object.copy_coordinates, before=reset, **params)
+        record(f"paste_coordinates/{kind}", bpy.ops.object.paste_coordinates, **params)
+        scene.clipboard_mode = 'MULTI'
+        scene.paste_mapping = 'INDEX'
+        record(f"copy_coordinates/{kind}/multi", bpy.ops.object.copy_coordinates, before=reset, **params)
+        record(f"paste_coordinates/{kind}/multi", bpy.ops.object.paste_coordinates, **params)
+        scene.clipboard_mode = 'SINGLE'
+
+    # 網格：依軸向選取、複製與貼上座標
+    for vert_count in scale["mesh_verts"]:
+        clear_scene()
+        obj = build_grid(bpy, vert_count)
+        activate(obj, 'EDIT')
+        bpy.ops.mesh.select_all(action='SELECT')
+        actual = len(obj.data.vertices)
+        record("select_by_axis/mesh", lambda: select_by_axis(obj), verts=actual)
+        bpy.ops.mesh.select_all(action='SELECT')
+        coordinate_cases(obj, "mesh", verts=actual)
+
+    # 頂點群組：設定權重與刪除空白群組
+    for group_count in scale["group_counts"]:
+        clear_scene()
+        obj = build_grid(bpy, scale["group_mesh_verts"])
+        assign_groups(obj, group_count)
+        actual = len(obj.data.vertices)
+        activate(obj, 'EDIT')
+        bpy.ops.mesh.select_all(action='SELECT')
+        obj.vertex_groups.active_index = 0
+        record("panel_draw/vertex_weight", lambda: draw_panel(weight_tool.VertexWeightPanel),
+               verts=actual, groups=group_count)
+        record("set_vertex_weight_extended", lambda: bpy.ops.object.set_vertex_weight_extended(weight=0.5),
+               before=weight_tool.invalidate_weights, verts=actual, groups=group_count)
+        activate(obj, 'OBJECT')
+
+        def delete_empty_groups():
+            bpy.ops.object.delete_empty_vertex_groups()
+
+        def add_empty_groups():
+            # 每次重新加入空白群組，讓每次執行刪除的數量相同
+            for index in range(max(1, group_count // 5)):
+                obj.vertex_groups.new(name=f"Empty.{index:03d}")
+            weight_tool.invalidate_weights()
+
+        record("delete_empty_vertex_groups", delete_empty_groups, before=add_empty_groups,
+               verts=actual, groups=group_count)
+
+    # 曲線：Bezier 與 NURBS
+    for spline_type in ('BEZIER', 'NURBS'):
+        clear_scene()
+        obj = build_curve(bpy, spline_type, scale["curve_points"])
+        activate(obj, 'EDIT')
+        bpy.ops.curve.select_all(action='SELECT')
+        kind = f"curve_{spline_type.lower()}"
+        record(f"select_by_axis/{kind}", lambda: select_by_axis(obj), points=scale["curve_points"])
+        bpy.ops.curve.select_all(action='SELECT')
+        coordinate_cases(obj, kind, points=scale["curve_points"])
+
+    # 骨架
+    clear_scene()
+    obj = build_armature(bpy, scale["bones"])
+    activate(obj, 'EDIT')
+    bpy.ops.armature.select_all(action='SELECT')
+    record("select_by_axis/armature", lambda: select_by_axis(obj), bones=scale["bones"])
+    bpy.ops.armature.select_all(action='SELECT')
+    coordinate_cases(obj, "armature", bones=scale["bones"])
+
+    clear_scene()
+    package.unregister()
+
+    return {
+        "blender": bpy.app.version_string,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": scale_name,
+        "repeat": repeat,
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "cases": results,
+    }
+
+
+# 場景產生
+def build_grid(bpy, vert_count):
+    """產生約 vert_count 個頂點的平面網格"""
+    side = max(2, int(round(vert_count ** 0.5)))
+    bpy.ops.mesh.primitive_grid_add(x_subdivisions=side, y_subdivisions=side, size=2.0)
+    return bpy.context.object
+
+
+def assign_groups(obj, group_count):
+    """建立 group_count 個頂點群組，每個頂點指派 INFLUENCES 個群組"""
+    vert_count = len(obj.data.vertices)
+    groups = [obj.vertex_groups.new(name=f"Group.{i:03d}") for i in range(group_count)]
+    influences = min(INFLUENCES, group_count)
+    for group_index, group in enumerate(groups):
+        for k in range(influences):
+            # 頂點 i 屬於群組 (i + k) % group_count
+            start = (group_index - k) % group_count
+            group.add(list(range(start, vert_count, group_count)), 0.1 * (k + 1), 'REPLACE')
+
+
+def build_curve(bpy, spline_type, point_count):
+    """產生總共 point_count 個控制點的曲線物件"""
+    import numpy as np
+
+    curve = bpy.data.curves.new("BenchmarkCurve", 'CURVE')
+    curve.dimensions = '3D'
+    remaining = point_count
+    offset = 0
+    while remaining > 0:
+        count = min(POINTS_PER_SPLINE, remaining)
+        spline = curve.splines.new(spline_type)
+        xs = np.linspace(-1.0, 1.0, count, dtype=np.float32)
+        ys = np.full(count, offset * 0.01 - 1.0, dtype=np.float32)
+        if spline_type == 'BEZIER':
+            spline.bezier_points.add(count - 1)
+            coords = np.column_stack((xs, ys, np.zeros(count, dtype=np.float32)))
+            for attribute in ("co", "handle_left", "handle_right"):
+                spline.bezier_points.foreach_set(attribute, coords.ravel())
+        else:
+            spline.points.add(count - 1)
+            coords = np.column_stack((xs, ys, np.zeros(count, dtype=np.float32), np.ones(count, dtype=np.float32)))
+            spline.points.foreach_set("co", coords.ravel())
+        remaining -= count
+        offset += 1
+
+    obj = bpy.data.objects.new("BenchmarkCurve", curve)
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+def build_armature(bpy, bone_count):
+    """產生 bone_count 根骨骼的骨架，每 10 根骨骼串成一條骨鏈"""
+    armature = bpy.data.armatures.new("BenchmarkArmature")
+    obj = bpy.data.objects.new("BenchmarkArmature", armature)
+    bpy.context.scene.collection.objects.link(obj)
+    bpy.context.view_layer.objects.active = obj
+    bpy.ops.object.mode_set(mode='EDIT')
+    parent = None
+    for index in range(bone_count):
+        bone = armature.edit_bones.new(f"Bone.{index:05d}")
+        x = (index // 10) * 0.05 - bone_count * 0.0025
+        z = (index % 10) * 0.1
+        bone.head = (x, 0.0, z)
+        bone.tail = (x, 0.0, z + 0.1)
+        if index % 10:
+            bone.parent = parent
+            bone.use_connect = True
+        parent = bone
+    bpy.ops.object.mode_set(mode='OBJECT')
+    return obj
+
+
+# 結果比較
+def compare(baseline_path, current_path, threshold, noise_floor=0.001):
+    """比較兩次結果，目前耗時超過基準 (1 + threshold) 倍的案例視為退步"""
+    def load(path):
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        return {(case["name"], json.dumps(case["params"], sort_keys=True)): case for case in data["cases"]}
+
+    baseline = load(baseline_path)
+    current = load(current_path)
+    regressions = 0
+    print(f"{'案例':<48} {'參數':<28} {'基準 ms':>10} {'目前 ms':>10} {'比例':>7}")
+    for key, case in current.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        ratio = case["min_s"] / base["min_s"] if base["min_s"] else float("inf")
+        regressed = ratio > 1.0 + threshold and case["min_s"] - base["min_s"] > noise_floor
+        regressions += regressed
+        print(f"{key[0]:<48} {key[1]:<28} {base['min_s'] * 1000:>10.2f} {case['min_s'] * 1000:>10.2f} "
+              f"{ratio:>6.2f}x{'  <-- 退步' if regressed else ''}")
+    print(f"退步案例數: {regressions}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="頂點工具附加元件效能測試")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="quick")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="結果 JSON 檔案路徑")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="比較兩次結果")
+    parser.add_argument("--threshold", type=float, default=0.15, help="視為退步的耗時增加比例")
+    args = parser.parse_args(script_args())
+
+    if args.compare:
+        return compare(args.compare[0], args.compare[1], args.threshold)
+
+    report = run_cases(args.scale, args.repeat)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        pathlib.Path(args.output).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    status = main()
+    if status:
+        sys.exit(status)
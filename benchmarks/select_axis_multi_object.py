@@ -0,0 +1,80 @@
+"""頂點選取工具：多物件編輯模式下依軸向選取的計時比較
+
+比較兩種做法在 N 個網格物件同時處於編輯模式時的耗時：
+- 逐物件切換：每個物件各自 OBJECT/EDIT 來回切換一次（舊做法）
+- 批次切換：所有物件共用一次模式切換（目前的運算符）
+
+用法：
+    blender -b --factory-startup --python benchmarks/select_axis_multi_object.py -- [物件數] [網格細分數]
+"""
+import pathlib
+import sys
+
+import bpy
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+from common import clear_scene, load_addon, script_args, timed
+
+
+def build_scene(object_count, subdivisions):
+    """產生 object_count 個網格物件並全部進入編輯模式"""
+    clear_scene()
+
+    objects = []
+    for i in range(object_count):
+        bpy.ops.mesh.primitive_grid_add(
+            x_subdivisions=subdivisions,
+            y_subdivisions=subdivisions,
+            size=2.0,
+            location=(i * 2.5 - object_count * 1.25, 0.0, 0.0),
+        )
+        objects.append(bpy.context.object)
+
+    for obj in objects:
+        obj.select_set(True)
+    bpy.context.view_layer.objects.active = objects[0]
+    bpy.ops.object.mode_set(mode='EDIT')
+    return objects
+
+
+def select_per_object(module, objects):
+    """舊做法：每個物件各自來回切換模式"""
+    query = module.axis_query((True, False, False), True)
+    for obj in objects:
+        bpy.ops.object.mode_set(mode='OBJECT')
+        module.select_mesh_region(obj.data, query, obj.matrix_world)
+        bpy.ops.object.mode_set(mode='EDIT')
+
+
+def select_batched(objects):
+    """目前做法：呼叫運算符，所有物件共用一次模式切換"""
+    with bpy.context.temp_override(objects_in_mode=objects):
+        bpy.ops.object.select_vertices_by_axis(
+            x_axis=True, y_axis=False, z_axis=False,
+            direction='POSITIVE', coord_mode='GLOBAL',
+        )
+
+
+def main():
+    argv = script_args()
+    object_count = int(argv[0]) if len(argv) > 0 else 40
+    subdivisions = int(argv[1]) if len(argv) > 1 else 100
+
+    package = load_addon()
+    module = package.選取工具
+    objects = build_scene(object_count, subdivisions)
+    vert_total = sum(len(obj.data.vertices) for obj in objects)
+
+    per_object = timed(select_per_object, module, objects)
+    batched = timed(select_batched, objects)
+
+    print(f"物件數: {object_count}, 總頂點數: {vert_total}")
+    print(f"逐物件切換: {per_object:.3f} s")
+    print(f"批次切換:   {batched:.3f} s")
+    print(f"加速倍數:   {per_object / batched:.1f}x")
+
+    package.unregister()
+
+
+if __name__ == "__main__":
+    main()
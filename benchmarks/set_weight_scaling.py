@@ -0,0 +1,127 @@
+"""頂點群組工具：設定頂點權重在不同選取數量下的計時比較
+
+比較兩種做法：
+- 舊做法：切換到物件模式，逐頂點、逐群組以名稱查找並呼叫 VertexGroup.add
+- 目前的運算符：在編輯模式下直接修改變形圖層
+
+每個頂點有 4 個影響群組（共 8 個群組），全部頂點皆被選取。
+兩種做法以相同次數計時，每次計時前都重新指派初始權重並清除權重快照，
+避免重複設定相同權重時只量到沒有變更的寫入與快取命中。
+
+用法：
+    blender -b --factory-startup --python benchmarks/set_weight_scaling.py -- [頂點數 ...] [--skip-legacy-above N]
+"""
+import math
+import pathlib
+import sys
+
+import bpy
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+from common import clear_scene, load_addon, script_args, timed
+
+GROUP_COUNT = 8
+INFLUENCES = 4
+WEIGHT_STEPS = (0.1, 0.2, 0.3, 0.4)
+REPEAT = 3
+
+
+def build_mesh(vert_count):
+    """產生約 vert_count 個頂點的網格，並指派權重後全選進入編輯模式"""
+    clear_scene()
+    side = max(2, int(math.sqrt(vert_count)))
+    bpy.ops.mesh.primitive_grid_add(x_subdivisions=side, y_subdivisions=side, size=2.0)
+    obj = bpy.context.object
+    for i in range(GROUP_COUNT):
+        obj.vertex_groups.new(name=f"Group.{i:03d}")
+    obj.vertex_groups.active_index = 0
+    assign_weights(obj)
+    bpy.ops.object.mode_set(mode='EDIT')
+    bpy.ops.mesh.select_all(action='SELECT')
+    return obj
+
+
+def assign_weights(obj):
+    """清除所有權重後重新指派初始權重（需在物件模式下呼叫）"""
+    count = len(obj.data.vertices)
+    groups = obj.vertex_groups
+    everything = list(range(count))
+    for group in groups:
+        group.remove(everything)
+    # 以索引餘數決定群組與權重，讓權重組合有一定的重複度
+    steps = [[i for i in range(count) if (i // GROUP_COUNT) % len(WEIGHT_STEPS) == step]
+             for step in range(len(WEIGHT_STEPS))]
+    for offset in range(INFLUENCES):
+        for indices, weight in zip(steps, WEIGHT_STEPS):
+            groups[offset].add(indices[0::2], weight, 'REPLACE')
+            groups[offset + INFLUENCES].add(indices[1::2], weight, 'REPLACE')
+
+
+def reset_weights(weight_tool, obj):
+    """回到初始權重與全選的編輯模式，並清除權重快照，每次計時都從相同的資料開始"""
+    bpy.ops.object.mode_set(mode='OBJECT')
+    assign_weights(obj)
+    bpy.ops.object.mode_set(mode='EDIT')
+    bpy.ops.mesh.select_all(action='SELECT')
+    weight_tool.invalidate_weights(obj)
+
+
+def set_weight_legacy(obj, weight):
+    """舊做法（保留作為比較基準）"""
+    vg = obj.vertex_groups.active
+    bpy.ops.object.mode_set(mode='OBJECT')
+    selected_indices = [v.index for v in obj.data.vertices if v.select]
+    for vert_index in selected_indices:
+        groups_weights = {}
+        for g in obj.data.vertices[vert_index].groups:
+            groups_weights[obj.vertex_groups[g.group].name] = g.weight
+        groups_weights[vg.name] = weight
+        other_total = sum(w for grp, w in groups_weights.items() if grp != vg.name)
+        vg.add([vert_index], weight, 'REPLACE')
+        if (1.0 - weight) > 0 and other_total > 0:
+            scale = (1.0 - weight) / other_total
+            for grp, w in groups_weights.items():
+                if grp != vg.name:
+                    obj.vertex_groups[grp].add([vert_index], max(min(w * scale, 1.0), 0.0), 'REPLACE')
+        else:
+            for grp in groups_weights:
+                if grp != vg.name:
+                    obj.vertex_groups[grp].add([vert_index], 0.0, 'REPLACE')
+    bpy.ops.object.mode_set(mode='EDIT')
+
+
+def set_weight_operator(obj, weight):
+    bpy.ops.object.set_vertex_weight_extended(weight=weight)
+
+
+def main():
+    argv = script_args()
+    skip_legacy_above = None
+    if "--skip-legacy-above" in argv:
+        position = argv.index("--skip-legacy-above")
+        skip_legacy_above = int(argv[position + 1])
+        del argv[position:position + 2]
+    sizes = [int(arg) for arg in argv] or [10_000, 100_000, 1_000_000]
+
+    package = load_addon()
+    weight_tool = package.群組工具
+
+    print(f"{'頂點數':>10} {'舊做法 (s)':>12} {'運算符 (s)':>12} {'加速倍數':>8}")
+    for size in sizes:
+        obj = build_mesh(size)
+        count = len(obj.data.vertices)
+        def reset():
+            reset_weights(weight_tool, obj)
+
+        current = timed(set_weight_operator, obj, 0.5, repeat=REPEAT, setup=reset)
+        if skip_legacy_above is not None and count > skip_legacy_above:
+            print(f"{count:>10} {'-':>12} {current:>12.3f} {'-':>8}")
+            continue
+        legacy = timed(set_weight_legacy, obj, 0.5, repeat=REPEAT, setup=reset)
+        print(f"{count:>10} {legacy:>12.3f} {current:>12.3f} {legacy / current:>7.1f}x")
+
+    package.unregister()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+bl_info = {
+    "name": "頂點工具",
+    "author": "破穗",
+    "version": (2, 0),
+    "blender": (4, 2, 4),
+    "location": "3D Viewport > Sidebar (N) > Item 標籤；3D Viewport > 工具列 > 選取",
+    "description": "複製與貼上座標、設置頂點群組權重、依軸向/區域選取頂點/控制點/骨骼",
+    "category": "Mesh",
+}
+
+# 只匯入註冊所需的類別與屬性，NumPy 等模組延後到第一次使用時才載入（見延遲匯入）
+from . import 效能分析, 資料存取, 鏡像對應, 座標工具, 群組工具, 選取工具
+
+# 依相依順序註冊，反註冊時反向；效能分析面板是工具包面板（群組工具）的子面板，需在其後註冊
+modules = (
+    資料存取,
+    鏡像對應,
+    座標工具,
+    群組工具,
+    效能分析,
+    選取工具,
+)
+
+
+def register():
+    for module in modules:
+        module.register()
+
+
+def unregister():
+    for module in reversed(modules):
+        module.unregister()
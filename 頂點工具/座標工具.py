@@ -0,0 +1,416 @@
+"""複製與貼上網格/曲線/骨架座標的工具"""
+import bmesh
+import bpy
+from mathutils import Vector
+
+from .延遲匯入 import kdtree, np
+from .效能分析 import phase, profiled
+from .資料存取 import (
+    count_selected,
+    edit_vertex_mask,
+    selected_coordinates,
+    transform_coords,
+    register_cache,
+    unregister_cache,
+    write_selected_coordinates,
+)
+
+# 選取統計快取：依物件、模式與座標來源保存，資料更新時由 depsgraph 處理器清除
+_selection_cache = {}
+
+
+class CoordinateClipboard:
+    """逐元素座標剪貼簿，座標以 float32 陣列保存在 RNA 之外"""
+    __slots__ = ("coords", "space", "history", "_kdtree")
+
+    def __init__(self, coords, space, history=None):
+        self.coords = coords
+        self.space = space
+        # 依選取順序排列的元素位置，來源沒有完整選取順序時為 None
+        self.history = history
+        self._kdtree = None
+
+    def kdtree(self):
+        """回傳來源座標的 KD 樹，第一次使用時建立，剪貼簿更換前都重複使用"""
+        if self._kdtree is None:
+            kd = kdtree.KDTree(len(self.coords))
+            insert = kd.insert
+            for index, co in enumerate(self.coords.tolist()):
+                insert(co, index)
+            kd.balance()
+            self._kdtree = kd
+        return self._kdtree
+
+    def match_nearest(self, query):
+        """查詢 (N, 3) 座標（與剪貼簿相同座標空間）最近的來源座標，回傳 (索引, 距離)"""
+        find = self.kdtree().find
+        _, index, distance = zip(*map(find, query.tolist()))
+        return np.array(index, dtype=np.int64), np.array(distance)
+
+
+_clipboard = None
+
+
+class SelectionStats:
+    """物件目前選取狀態的統計，座標在第一次使用時才計算"""
+    __slots__ = ("signal", "count", "coords", "error", "reductions")
+
+    def __init__(self, signal, count):
+        self.signal = signal
+        self.count = count
+        self.coords = None
+        self.error = None
+        # 依座標模式保存各種統計值
+        self.reductions = {}
+
+
+# 工具函數
+def get_selection_stats(context, source='ORIGINAL'):
+    """回傳目前物件的選取統計，未變更時直接使用快取"""
+    obj = context.object
+    if obj is None or obj.data is None:
+        return None
+    key = (obj.as_pointer(), obj.data.as_pointer(), context.mode, source)
+    # 網格編輯模式下選取數量可直接取得，作為額外的變更訊號
+    signal = obj.data.total_vert_sel if context.mode == 'EDIT_MESH' else None
+    stats = _selection_cache.get(key)
+    if stats is None or stats.signal != signal:
+        stats = SelectionStats(signal, count_selected(obj, context.mode))
+        _selection_cache[key] = stats
+    return stats
+
+
+def get_selected_element_count(context):
+    stats = get_selection_stats(context)
+    return stats.count if stats else 0
+
+
+def reduce_coordinates(coords):
+    """一次計算平均、邊界框中心、中位數與各軸最小/最大值"""
+    coords = coords.astype(np.float64)
+    low = coords.min(axis=0)
+    high = coords.max(axis=0)
+    return {
+        'MEAN': Vector(coords.mean(axis=0)),
+        'BOUNDS_CENTER': Vector((low + high) / 2.0),
+        'MEDIAN': Vector(np.median(coords, axis=0)),
+        'MIN': Vector(low),
+        'MAX': Vector(high),
+    }
+
+
+def get_selected_coordinate_array(context, source='ORIGINAL'):
+    """回傳選取元素依索引順序排列的 (N, 3) 區域座標，使用選取統計快取
+
+    source 為 'EVALUATED' 時網格讀取評估後（變形後）的座標。
+    """
+    stats = get_selection_stats(context, source)
+    if stats is None:
+        return None, "目前物件類型或模式不支援"
+    if stats.coords is None and stats.error is None:
+        depsgraph = context.evaluated_depsgraph_get() if source == 'EVALUATED' else None
+        with phase("extract"):
+            stats.coords, stats.error = selected_coordinates(context.object, context.mode, depsgraph)
+    return stats.coords, stats.error
+
+
+def get_selected_coordinates(context, mode, reduction='MEAN', source='ORIGINAL'):
+    coords, error = get_selected_coordinate_array(context, source)
+    if error:
+        return None, error
+    stats = get_selection_stats(context, source)
+    if mode not in stats.reductions:
+        if context.object.type == 'ARMATURE':
+            # 骨骼沿用最後一個選取骨骼的頭部座標
+            coords = coords[-1:]
+        if mode == 'GLOBAL':
+            # 先轉換到全域再統計，最小/最大值與邊界框才會對應全域軸向
+            coords = transform_coords(coords, context.object.matrix_world)
+        with phase("compute"):
+            stats.reductions[mode] = reduce_coordinates(coords)
+    return stats.reductions[mode][reduction].copy(), None
+
+
+def selection_history_order(obj, mode):
+    """回傳依選取順序排列的元素位置（相對於索引順序），無完整選取順序時回傳 None"""
+    if obj.type != 'MESH' or mode != 'EDIT_MESH':
+        return None
+    bm = bmesh.from_edit_mesh(obj.data)
+    bm.verts.index_update()
+    history = [elem.index for elem in bm.select_history if isinstance(elem, bmesh.types.BMVert)]
+    selected = np.flatnonzero(edit_vertex_mask(obj))
+    if len(history) != len(selected):
+        return None
+    return np.searchsorted(selected, history)
+
+
+def invalidate_selection(obj):
+    """清除物件的選取統計"""
+    pointers = {obj.as_pointer(), obj.data.as_pointer()}
+    for key in [key for key in _selection_cache if key[0] in pointers or key[1] in pointers]:
+        del _selection_cache[key]
+
+
+def _drop_selection(updated, geometry):
+    """物件或其資料更新（包含選取變更）時清除對應的選取統計"""
+    stale = [key for key in _selection_cache if key[0] in updated or key[1] in updated]
+    for key in stale:
+        del _selection_cache[key]
+
+
+# 運算符類
+class CopyCoordinatesOperator(bpy.types.Operator):
+    bl_idname = "object.copy_coordinates"
+    bl_label = "複製座標"
+
+    @profiled
+    def execute(self, context):
+        if context.scene.clipboard_mode == 'MULTI':
+            return self.copy_multiple(context)
+
+        scene = context.scene
+        coord, error = get_selected_coordinates(
+            context, scene.coordinate_mode, scene.coordinate_reduction, scene.coordinate_source)
+        if error:
+            self.report({'WARNING'}, error)
+            return {'CANCELLED'}
+        scene.copied_coordinates = coord
+        self.report({'INFO'}, f"複製了座標 {tuple(coord)} ({scene.coordinate_mode})")
+        return {'FINISHED'}
+
+    def copy_multiple(self, context):
+        """依索引順序複製所有選取元素的座標"""
+        global _clipboard
+        coords, error = get_selected_coordinate_array(context, context.scene.coordinate_source)
+        if error:
+            self.report({'WARNING'}, error)
+            return {'CANCELLED'}
+        space = context.scene.coordinate_mode
+        if space == 'GLOBAL':
+            coords = transform_coords(coords, context.object.matrix_world)
+        history = selection_history_order(context.object, context.mode)
+        _clipboard = CoordinateClipboard(coords.astype(np.float32), space, history)
+        self.report({'INFO'}, f"複製了 {len(coords)} 個座標 ({space})")
+        return {'FINISHED'}
+
+class PasteCoordinatesOperator(bpy.types.Operator):
+    """貼上座標"""
+    bl_idname = "object.paste_coordinates"
+    bl_label = "貼上座標"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @profiled
+    def execute(self, context):
+        if context.scene.clipboard_mode == 'MULTI':
+            return self.paste_multiple(context)
+
+        coord = context.scene.copied_coordinates
+        if coord is None:
+            self.report({'WARNING'}, "沒有複製的座標")
+            return {'CANCELLED'}
+
+        element_names = {
+            'EDIT_MESH': ("頂點", "未選取任何頂點"),
+            'EDIT_CURVE': ("控制點", "未選取任何控制點"),
+            'EDIT_ARMATURE': ("骨骼頭部", "未選取任何骨骼"),
+            'POSE': ("骨骼頭部", "未選取任何骨骼"),
+        }
+        if context.mode not in element_names:
+            self.report({'WARNING'}, "目前物件類型或模式不支援貼上功能")
+            return {'CANCELLED'}
+
+        # 確保 coord 是 Vector 類型，便於矩陣乘法
+        coord = Vector(coord)
+        is_global = context.scene.coordinate_mode == 'GLOBAL'
+
+        # 每個物件只計算一次目標區域座標，再一次寫入該物件所有選取元素
+        count = 0
+        for obj in context.objects_in_mode or [context.object]:
+            target = obj.matrix_world.inverted() @ coord if is_global else coord
+            with phase("write_back"):
+                count += write_selected_coordinates(obj, context.mode, target)
+            invalidate_selection(obj)
+
+        element_name, empty_message = element_names[context.mode]
+        if not count:
+            self.report({'WARNING'}, empty_message)
+            return {'CANCELLED'}
+
+        coord_str = f"({coord[0]:.2f}, {coord[1]:.2f}, {coord[2]:.2f})"
+        self.report({'INFO'}, f"貼上給 {count} 個{element_name}座標 {coord_str} ({'全域' if is_global else '區域'})")
+        return {'FINISHED'}
+
+    def paste_multiple(self, context):
+        """將剪貼簿中的座標逐一對應貼到目前選取的元素"""
+        if _clipboard is None:
+            self.report({'WARNING'}, "沒有複製的逐元素座標")
+            return {'CANCELLED'}
+        target, error = get_selected_coordinate_array(context)
+        if error:
+            self.report({'WARNING'}, error)
+            return {'CANCELLED'}
+
+        matrix = np.array(context.object.matrix_world)
+        to_local = np.linalg.inv(matrix) if _clipboard.space == 'GLOBAL' else None
+        source = _clipboard.coords
+
+        mapping = context.scene.paste_mapping
+        if mapping == 'NEAREST':
+            # 在剪貼簿的座標空間中查詢，KD 樹只依賴剪貼簿內容，可重複使用
+            query = transform_coords(target, matrix) if to_local is not None else target
+            with phase("compute"):
+                index, distance = _clipboard.match_nearest(query)
+            max_distance = context.scene.paste_max_distance
+            accepted = distance <= max_distance if max_distance > 0 else np.ones(len(index), dtype=bool)
+            result = target.copy()
+            matched = source[index[accepted]]
+            result[accepted] = transform_coords(matched, to_local) if to_local is not None else matched
+            rejected = len(result) - int(accepted.sum())
+            if rejected:
+                self.report({'WARNING'}, f"{rejected} 個元素超出最大距離，保持原位")
+            if not accepted.any():
+                return {'CANCELLED'}
+        elif len(target) != len(source):
+            self.report({'WARNING'}, f"選取數量 ({len(target)}) 與剪貼簿座標數量 ({len(source)}) 不同")
+            return {'CANCELLED'}
+        else:
+            if to_local is not None:
+                source = transform_coords(source, to_local)
+            if mapping == 'HISTORY':
+                target_order = selection_history_order(context.object, context.mode)
+                if _clipboard.history is None or target_order is None:
+                    self.report({'WARNING'}, "來源或目標沒有完整的選取順序")
+                    return {'CANCELLED'}
+                result = np.empty_like(source)
+                result[target_order] = source[_clipboard.history]
+            else:
+                result = source
+
+        with phase("write_back"):
+            write_selected_coordinates(context.object, context.mode, result)
+        invalidate_selection(context.object)
+        self.report({'INFO'}, f"貼上了 {len(result)} 個座標 ({_clipboard.space})")
+        return {'FINISHED'}
+
+class SwitchCoordinateModeOperator(bpy.types.Operator):
+    """切換座標模式"""
+    bl_idname = "object.switch_coordinate_mode"
+    bl_label = "切換座標模式"
+
+    target_mode: bpy.props.StringProperty()
+
+    def execute(self, context):
+        context.scene.coordinate_mode = self.target_mode
+        self.report({'INFO'}, f"切換到 {'全域' if self.target_mode == 'GLOBAL' else '區域'}座標模式")
+        return {'FINISHED'}
+
+# UI 面板
+class CopyPasteCoordinatesPanel(bpy.types.Panel):
+    bl_label = "複製與貼上座標"
+    bl_idname = "VIEW3D_PT_copy_paste_coordinates"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'Item'
+
+    @profiled
+    def draw(self, context):
+        layout = self.layout
+        
+        element_count = get_selected_element_count(context)
+        if element_count == 0:
+            layout.label(text="請選取一個或多個頂點/控制點/骨骼")
+            return
+        
+        row = layout.row(align=True)
+        row.operator(SwitchCoordinateModeOperator.bl_idname, text="全域座標", depress=(context.scene.coordinate_mode == 'GLOBAL')).target_mode = 'GLOBAL'
+        row.operator(SwitchCoordinateModeOperator.bl_idname, text="區域座標", depress=(context.scene.coordinate_mode == 'LOCAL')).target_mode = 'LOCAL'
+        if context.mode == 'EDIT_MESH':
+            row = layout.row(align=True)
+            row.prop(context.scene, "coordinate_source", expand=True)
+        row = layout.row(align=True)
+        row.prop(context.scene, "clipboard_mode", expand=True)
+        if context.scene.clipboard_mode == 'MULTI':
+            layout.prop(context.scene, "paste_mapping", text="")
+            if context.scene.paste_mapping == 'NEAREST':
+                layout.prop(context.scene, "paste_max_distance")
+            if _clipboard is not None:
+                layout.label(text=f"剪貼簿: {len(_clipboard.coords)} 個座標")
+        else:
+            layout.prop(context.scene, "coordinate_reduction", text="")
+        layout.separator()
+        layout.operator(CopyCoordinatesOperator.bl_idname)
+        layout.operator(PasteCoordinatesOperator.bl_idname)
+
+# 註冊與反註冊
+classes = (
+    CopyCoordinatesOperator,
+    PasteCoordinatesOperator,
+    SwitchCoordinateModeOperator,
+    CopyPasteCoordinatesPanel,
+)
+
+def register():
+    register_cache(_selection_cache.clear, _drop_selection)
+    bpy.types.Scene.copied_coordinates = bpy.props.FloatVectorProperty(size=3, name="複製座標")
+    bpy.types.Scene.coordinate_mode = bpy.props.EnumProperty(
+        items=[('LOCAL', "區域座標", ""), ('GLOBAL', "全域座標", "")],
+        name="座標模式",
+        default='LOCAL'
+    )
+    bpy.types.Scene.coordinate_reduction = bpy.props.EnumProperty(
+        items=[
+            ('MEAN', "平均", "所有選取元素的平均座標"),
+            ('BOUNDS_CENTER', "邊界框中心", "選取元素邊界框的中心"),
+            ('MEDIAN', "中位數", "各軸座標的中位數"),
+            ('MIN', "最小值", "各軸座標的最小值"),
+            ('MAX', "最大值", "各軸座標的最大值"),
+        ],
+        name="複製統計方式",
+        default='MEAN'
+    )
+    bpy.types.Scene.coordinate_source = bpy.props.EnumProperty(
+        items=[
+            ('ORIGINAL', "編輯座標", "複製網格本身的頂點座標"),
+            ('EVALUATED', "變形後座標", "複製修改器、形態鍵與骨架變形之後的頂點座標"),
+        ],
+        name="座標來源",
+        default='ORIGINAL'
+    )
+    bpy.types.Scene.clipboard_mode = bpy.props.EnumProperty(
+        items=[
+            ('SINGLE', "單一座標", "複製一個統計座標並貼到所有選取元素"),
+            ('MULTI', "逐元素座標", "複製每個選取元素的座標並逐一對應貼上"),
+        ],
+        name="剪貼簿模式",
+        default='SINGLE'
+    )
+    bpy.types.Scene.paste_mapping = bpy.props.EnumProperty(
+        items=[
+            ('INDEX', "索引順序", "依元素索引順序一對一對應"),
+            ('NEAREST', "最近點", "每個目標元素使用距離最近的來源座標"),
+            ('HISTORY', "選取順序", "依網格的選取順序一對一對應"),
+        ],
+        name="貼上對應方式",
+        default='INDEX'
+    )
+    bpy.types.Scene.paste_max_distance = bpy.props.FloatProperty(
+        name="最大距離",
+        description="最近點對應超過此距離時不貼上，0 表示不限制",
+        default=0.0,
+        min=0.0,
+        unit='LENGTH'
+    )
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+def unregister():
+    for cls in classes:
+        bpy.utils.unregister_class(cls)
+    del bpy.types.Scene.copied_coordinates
+    del bpy.types.Scene.coordinate_mode
+    del bpy.types.Scene.coordinate_reduction
+    del bpy.types.Scene.coordinate_source
+    del bpy.types.Scene.clipboard_mode
+    del bpy.types.Scene.paste_mapping
+    del bpy.types.Scene.paste_max_distance
+    unregister_cache(_selection_cache.clear)
@@ -0,0 +1,29 @@
+"""第一次使用時才匯入的模組
+
+NumPy 匯入需要數十到數百毫秒，各工具以這裡的代理物件取代模組層級的匯入，
+啟用附加元件與啟動 Blender 時不會載入，第一次呼叫運算符或繪製面板內容時才載入。
+"""
+import importlib
+
+
+class LazyModule:
+    """第一次取用屬性時才匯入模組，之後直接轉交給已匯入的模組"""
+    __slots__ = ("_name", "_module")
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        module = self._module
+        if module is None:
+            module = self._module = importlib.import_module(self._name)
+        return getattr(module, attr)
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+
+np = LazyModule("numpy")
+kdtree = LazyModule("mathutils.kdtree")
@@ -0,0 +1,247 @@
+"""記錄頂點座標/群組/選取工具各運算符與面板的分段耗時"""
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import pstats
+import time
+from collections import deque
+
+import bpy
+
+# 未啟用時 profiled 與 phase 只多一次旗標檢查
+_enabled = False
+_capture_profile = False
+# 面板 draw() 每次側邊欄重繪都會呼叫，預設不記錄，以免運算符的記錄被擠出
+_profile_draw = False
+# 目前正在記錄的呼叫，巢狀呼叫時由外層保存
+_current = None
+_NO_PHASE = contextlib.nullcontext()
+
+records = deque(maxlen=50)
+
+
+class TimingRecord:
+    """一次 execute() 或 draw() 呼叫的耗時記錄"""
+    __slots__ = ("name", "timestamp", "total", "phases", "profile")
+
+    def __init__(self, name):
+        self.name = name
+        self.timestamp = time.time()
+        self.total = 0.0
+        self.phases = {}
+        self.profile = None
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "timestamp": self.timestamp,
+            "total_s": self.total,
+            "phases_s": self.phases,
+            "profile": self.profile,
+        }
+
+
+class _Phase:
+    __slots__ = ("record", "name", "start")
+
+    def __init__(self, record, name):
+        self.record = record
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        self.record.phases[self.name] = self.record.phases.get(self.name, 0.0) + elapsed
+        return False
+
+
+def phase(name):
+    """量測一個階段的耗時，例如 extract、compute、write_back、mode_set、update_edit_mesh"""
+    if _current is None:
+        return _NO_PHASE
+    return _Phase(_current, name)
+
+
+def profiled(func):
+    """包裝運算符的 execute() 或面板的 draw()，啟用時記錄總耗時與各階段耗時
+
+    面板的 draw() 只有在 記錄面板繪製 也啟用時才記錄。
+    """
+    is_draw = func.__name__ == "draw"
+
+    @functools.wraps(func)
+    def wrapper(self, context):
+        global _current
+        if not _enabled or (is_draw and not _profile_draw):
+            return func(self, context)
+
+        # 以實際的類別命名，共用基底類別的 execute() 也能區分是哪個運算符
+        record = TimingRecord(f"{type(self).__name__}.{func.__name__}")
+        outer, _current = _current, record
+        profiler = cProfile.Profile() if _capture_profile else None
+        start = time.perf_counter()
+        try:
+            if profiler is not None:
+                return profiler.runcall(func, self, context)
+            return func(self, context)
+        finally:
+            record.total = time.perf_counter() - start
+            _current = outer
+            if profiler is not None:
+                stream = io.StringIO()
+                pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(30)
+                record.profile = stream.getvalue()
+            records.append(record)
+
+    return wrapper
+
+
+def export_records(filepath):
+    """將記錄以每行一筆 JSON 的格式寫入檔案"""
+    with open(filepath, "w", encoding="utf-8") as file:
+        for record in records:
+            file.write(json.dumps(record.as_dict(), ensure_ascii=False) + "\n")
+    return len(records)
+
+
+# 設定（存放於 WindowManager，不會寫入 .blend 檔）
+def _update_enabled(self, context):
+    global _enabled
+    _enabled = self.vertex_tools_profiling
+
+
+def _update_capture(self, context):
+    global _capture_profile
+    _capture_profile = self.vertex_tools_capture_profile
+
+
+def _update_draw(self, context):
+    global _profile_draw
+    _profile_draw = self.vertex_tools_profile_draw
+
+
+def _update_size(self, context):
+    global records
+    records = deque(records, maxlen=self.vertex_tools_profiling_size)
+
+
+class ExportTimingsOperator(bpy.types.Operator):
+    """將效能記錄匯出為 JSON Lines 檔案"""
+    bl_idname = "wm.vertex_tools_export_timings"
+    bl_label = "匯出效能記錄"
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH', default="頂點工具效能記錄.jsonl")
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        count = export_records(bpy.path.abspath(self.filepath))
+        self.report({'INFO'}, f"匯出了 {count} 筆效能記錄")
+        return {'FINISHED'}
+
+
+class ClearTimingsOperator(bpy.types.Operator):
+    """清除所有效能記錄"""
+    bl_idname = "wm.vertex_tools_clear_timings"
+    bl_label = "清除效能記錄"
+
+    def execute(self, context):
+        records.clear()
+        return {'FINISHED'}
+
+
+class ProfilingPanel(bpy.types.Panel):
+    """在工具包面板下以子面板顯示最近的效能記錄"""
+    bl_label = "效能分析"
+    bl_idname = "VIEW3D_PT_vertex_tools_profiling"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Item"
+    bl_parent_id = "VIEW3D_PT_toolkit"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        wm = context.window_manager
+
+        layout.prop(wm, "vertex_tools_profiling")
+        row = layout.row()
+        row.enabled = wm.vertex_tools_profiling
+        row.prop(wm, "vertex_tools_capture_profile")
+        row = layout.row()
+        row.enabled = wm.vertex_tools_profiling
+        row.prop(wm, "vertex_tools_profile_draw")
+        layout.prop(wm, "vertex_tools_profiling_size")
+
+        row = layout.row(align=True)
+        row.operator(ExportTimingsOperator.bl_idname, icon='EXPORT')
+        row.operator(ClearTimingsOperator.bl_idname, icon='TRASH')
+
+        if not records:
+            layout.label(text="尚無記錄")
+            return
+
+        column = layout.column(align=True)
+        for record in reversed(records):
+            box = column.box()
+            box.label(text=f"{record.name}: {record.total * 1000:.2f} ms")
+            for name, elapsed in record.phases.items():
+                box.label(text=f"    {name}: {elapsed * 1000:.2f} ms")
+
+
+classes = (
+    ExportTimingsOperator,
+    ClearTimingsOperator,
+    ProfilingPanel,
+)
+
+
+def register():
+    bpy.types.WindowManager.vertex_tools_profiling = bpy.props.BoolProperty(
+        name="啟用效能分析",
+        description="記錄頂點工具各運算符與面板的耗時",
+        default=False,
+        update=_update_enabled
+    )
+    bpy.types.WindowManager.vertex_tools_capture_profile = bpy.props.BoolProperty(
+        name="記錄 cProfile",
+        description="每次呼叫都以 cProfile 記錄函數層級的耗時（會增加額外負擔）",
+        default=False,
+        update=_update_capture
+    )
+    bpy.types.WindowManager.vertex_tools_profile_draw = bpy.props.BoolProperty(
+        name="記錄面板繪製",
+        description="同時記錄面板 draw() 的耗時（側邊欄每次重繪都會新增一筆）",
+        default=False,
+        update=_update_draw
+    )
+    bpy.types.WindowManager.vertex_tools_profiling_size = bpy.props.IntProperty(
+        name="保留筆數",
+        description="保留最近幾筆效能記錄",
+        default=50,
+        min=1,
+        max=1000,
+        update=_update_size
+    )
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+
+def unregister():
+    global _enabled, _capture_profile, _profile_draw
+    _enabled = False
+    _capture_profile = False
+    _profile_draw = False
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    del bpy.types.WindowManager.vertex_tools_profiling
+    del bpy.types.WindowManager.vertex_tools_capture_profile
+    del bpy.types.WindowManager.vertex_tools_profile_draw
+    del bpy.types.WindowManager.vertex_tools_profiling_size
@@ -0,0 +1,839 @@
+"""設置頂點群組權重並刪除空白頂點群組的工具"""
+import functools
+import itertools
+import operator
+import os
+import time
+
+import bmesh
+import bpy
+
+from .延遲匯入 import np
+from .效能分析 import phase, profiled
+from .資料存取 import edit_vertex_coordinates, register_cache, selected_vertex_mask, unregister_cache
+from .鏡像對應 import mirror_group_indices, mirror_map, unique_pairs
+
+
+# 權重快照 (CSR 稀疏矩陣)
+class WeightSnapshot:
+    """以 CSR 格式保存網格所有頂點的群組權重
+
+    第 i 個頂點的權重位於 group_index / weight 的 indptr[i]:indptr[i + 1] 範圍，
+    每個頂點內的群組索引由小到大排列。
+    """
+    __slots__ = ("indptr", "group_index", "weight", "group_count")
+
+    def __init__(self, indptr, group_index, weight, group_count):
+        self.indptr = indptr
+        self.group_index = group_index
+        self.weight = weight
+        self.group_count = group_count
+
+    @property
+    def vert_count(self):
+        return len(self.indptr) - 1
+
+    def rows(self):
+        """回傳每個權重項目所屬的頂點索引"""
+        return np.repeat(np.arange(self.vert_count, dtype=np.int32), np.diff(self.indptr))
+
+    def keys(self, stride):
+        """回傳每個權重項目的 (頂點, 群組) 排序鍵，stride 需大於所有群組索引"""
+        return self.rows().astype(np.int64) * stride + self.group_index
+
+    def copy(self):
+        return WeightSnapshot(self.indptr.copy(), self.group_index.copy(), self.weight.copy(), self.group_count)
+
+    @classmethod
+    def from_entries(cls, rows, group_index, weight, vert_count, group_count):
+        """由 (頂點, 群組, 權重) 項目建立快照，項目會依頂點與群組排序"""
+        order = np.lexsort((group_index, rows))
+        rows = np.asarray(rows, dtype=np.int32)[order]
+        indptr = np.zeros(vert_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=vert_count), out=indptr[1:])
+        return cls(
+            indptr,
+            np.asarray(group_index, dtype=np.int32)[order],
+            np.asarray(weight, dtype=np.float32)[order],
+            group_count,
+        )
+
+
+# 依網格資料與是否為編輯模式快取的權重快照
+_weight_snapshots = {}
+# 本模組剛寫入權重的網格資料位址，寫入觸發的下一次 depsgraph 更新不清除其快照
+_own_writes = set()
+
+
+def _snapshot_key(obj):
+    return obj.data.as_pointer(), obj.mode == 'EDIT'
+
+
+def _read_weight_entries(obj):
+    """一次讀取所有頂點的權重，回傳 CSR 的三個陣列（群組索引尚未排序）
+
+    頂點群組沒有 foreach_get 可用，改讀 BMesh 的變形圖層：物件模式下先將網格轉為暫時的 BMesh，
+    兩種模式共用同一段讀取。逐頂點的迭代以 map/itemgetter/chain 進行，不經過 Python 迴圈主體。
+    """
+    if obj.mode == 'EDIT':
+        # 編輯模式下 obj.data.vertices 的權重尚未同步
+        bm = bmesh.from_edit_mesh(obj.data)
+        owned = False
+    else:
+        bm = bmesh.new()
+        bm.from_mesh(obj.data)
+        owned = True
+    try:
+        vert_count = len(bm.verts)
+        indptr = np.zeros(vert_count + 1, dtype=np.int64)
+        deform = bm.verts.layers.deform.active
+        if deform is None:
+            return indptr, np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        entries = list(map(operator.methodcaller("items"), map(operator.itemgetter(deform), bm.verts)))
+    finally:
+        if owned:
+            bm.free()
+
+    np.cumsum(np.fromiter(map(len, entries), dtype=np.int64, count=vert_count), out=indptr[1:])
+    flat = np.fromiter(itertools.chain.from_iterable(itertools.chain.from_iterable(entries)),
+                       dtype=np.float64, count=int(indptr[-1]) * 2)
+    return indptr, flat[0::2].astype(np.int32), flat[1::2].astype(np.float32)
+
+
+def read_weights(obj):
+    """回傳物件的權重快照，資料變更前會重複使用快取
+
+    回傳的快照為共用物件，修改前請先呼叫 copy()。
+    """
+    key = _snapshot_key(obj)
+    snapshot = _weight_snapshots.get(key)
+    if snapshot is None:
+        indptr, group_index, weight = _read_weight_entries(obj)
+        rows = np.repeat(np.arange(len(indptr) - 1, dtype=np.int32), np.diff(indptr))
+        snapshot = WeightSnapshot.from_entries(rows, group_index, weight, len(indptr) - 1, len(obj.vertex_groups))
+        _weight_snapshots[key] = snapshot
+    snapshot.group_count = len(obj.vertex_groups)
+    return snapshot
+
+
+def invalidate_weights(obj=None):
+    """清除指定物件（或全部）的權重快照"""
+    if obj is None:
+        _weight_snapshots.clear()
+        _own_writes.clear()
+        return
+    pointer = obj.data.as_pointer()
+    for key in [key for key in _weight_snapshots if key[0] == pointer]:
+        del _weight_snapshots[key]
+
+
+def write_weights(obj, snapshot):
+    """將修改後的快照寫回物件，只寫入與目前資料不同的項目
+
+    編輯模式下直接寫入變形圖層；物件模式下將相同群組、相同權重的頂點合併為一次
+    VertexGroup.add 呼叫，刪除的項目則每個群組一次 VertexGroup.remove。
+    回傳 (寫入項目數, 刪除項目數)。
+    """
+    current = read_weights(obj)
+    stride = max(current.group_count, snapshot.group_count,
+                 int(current.group_index.max(initial=-1)) + 1,
+                 int(snapshot.group_index.max(initial=-1)) + 1)
+    old_keys = current.keys(stride)
+    new_keys = snapshot.keys(stride)
+    new_rows = snapshot.rows()
+
+    # 找出新增或權重改變的項目
+    position = np.searchsorted(old_keys, new_keys)
+    found = position < len(old_keys)
+    found[found] = old_keys[position[found]] == new_keys[found]
+    changed = ~found
+    changed[found] = current.weight[position[found]] != snapshot.weight[found]
+
+    # 找出被移除的項目
+    removed = ~np.isin(old_keys, new_keys, assume_unique=True)
+    old_rows = current.rows()
+
+    set_rows = new_rows[changed]
+    set_groups = snapshot.group_index[changed]
+    set_weights = snapshot.weight[changed]
+    remove_rows = old_rows[removed]
+    remove_groups = current.group_index[removed]
+
+    if not len(set_rows) and not len(remove_rows):
+        return 0, 0
+
+    if obj.mode == 'EDIT':
+        bm = bmesh.from_edit_mesh(obj.data)
+        deform = bm.verts.layers.deform.verify()
+        bm.verts.ensure_lookup_table()
+        verts = bm.verts
+        for row, group in zip(remove_rows.tolist(), remove_groups.tolist()):
+            del verts[row][deform][group]
+        for row, group, value in zip(set_rows.tolist(), set_groups.tolist(), set_weights.tolist()):
+            verts[row][deform][group] = value
+        with phase("update_edit_mesh"):
+            bmesh.update_edit_mesh(obj.data)
+    else:
+        vertex_groups = obj.vertex_groups
+        for group in np.unique(remove_groups).tolist():
+            vertex_groups[group].remove(remove_rows[remove_groups == group].tolist())
+        # 依 (群組, 權重) 排序後分段，每段一次 add 呼叫
+        order = np.lexsort((set_weights, set_groups))
+        set_rows, set_groups, set_weights = set_rows[order], set_groups[order], set_weights[order]
+        breaks = np.flatnonzero((np.diff(set_groups) != 0) | (np.diff(set_weights) != 0)) + 1
+        for start, end in zip(np.r_[0, breaks].tolist(), np.r_[breaks, len(set_rows)].tolist()):
+            if start == end:
+                continue
+            vertex_groups[int(set_groups[start])].add(set_rows[start:end].tolist(), float(set_weights[start]), 'REPLACE')
+
+    # 寫入後的資料即為 snapshot，保留快取供下一次操作使用
+    _weight_snapshots[_snapshot_key(obj)] = snapshot.copy()
+    _own_writes.add(obj.data.as_pointer())
+    return len(set_rows), len(remove_rows)
+
+
+def set_weight_normalized(snapshot, selected, target_index, target_weight):
+    """將選取頂點的目標群組設為 target_weight，並等比例縮放其他群組使總和為 1
+
+    target_weight 可為單一數值或每個頂點一個數值的陣列。
+    無法歸一化時（目標權重為 1 或沒有其他權重）其他群組權重設為 0。
+    回傳新的快照。
+    """
+    rows = snapshot.rows()
+    in_selection = selected[rows]
+    is_target = snapshot.group_index == target_index
+    others = in_selection & ~is_target
+    target_weight = np.broadcast_to(np.asarray(target_weight, dtype=np.float32), (snapshot.vert_count,))
+
+    # 計算其他群組的總權重與縮放比例
+    other_total = np.bincount(rows[others], weights=snapshot.weight[others], minlength=snapshot.vert_count)
+    scale = np.zeros(snapshot.vert_count)
+    remainder = 1.0 - target_weight.astype(np.float64)
+    valid = (remainder > 0) & (other_total > 0)
+    scale[valid] = remainder[valid] / other_total[valid]
+
+    weight = snapshot.weight.copy()
+    weight[others] = np.clip(weight[others] * scale[rows[others]], 0.0, 1.0)
+    weight[in_selection & is_target] = target_weight[rows[in_selection & is_target]]
+
+    # 尚未屬於目標群組的選取頂點需新增項目
+    has_target = np.zeros(snapshot.vert_count, dtype=bool)
+    has_target[rows[is_target]] = True
+    missing = np.flatnonzero(selected & ~has_target)
+
+    return WeightSnapshot.from_entries(
+        np.concatenate((rows, missing)),
+        np.concatenate((snapshot.group_index, np.full(len(missing), target_index, dtype=np.int32))),
+        np.concatenate((weight, target_weight[missing])),
+        snapshot.vert_count,
+        snapshot.group_count,
+    )
+
+
+def falloff_weights(distance, radius, falloff, start, end, curve=None):
+    """依距離計算漸變權重：距離 0 為 start，距離 radius 以上為 end
+
+    falloff 為 'LINEAR'、'SMOOTH' 或 'CURVE'；'CURVE' 時 curve 為由距離 0 到 radius
+    均勻取樣的衰減值（1 為 start、0 為 end），樣本之間線性內插。
+    """
+    t = np.clip(distance / radius, 0.0, 1.0) if radius > 0 else np.zeros_like(distance)
+    if falloff == 'LINEAR':
+        factor = 1.0 - t
+    elif falloff == 'SMOOTH':
+        s = 1.0 - t
+        factor = s * s * (3.0 - 2.0 * s)
+    else:
+        curve = np.asarray(curve, dtype=np.float64)
+        factor = np.interp(t, np.linspace(0.0, 1.0, len(curve)), curve)
+    return np.clip(end + (start - end) * factor, 0.0, 1.0).astype(np.float32)
+
+
+def mirror_weights(snapshot, source, target, group_map):
+    """將 source 頂點的權重複製到對應的 target 頂點（取代原本的權重），群組索引以 group_map 轉換
+
+    source 與 target 需一一對應，回傳新的快照。
+    """
+    rows = snapshot.rows()
+    row_target = np.full(snapshot.vert_count, -1, dtype=np.int64)
+    row_target[source] = target
+    replaced = np.zeros(snapshot.vert_count, dtype=bool)
+    replaced[target] = True
+
+    keep = ~replaced[rows]
+    copied = row_target[rows] >= 0
+    return WeightSnapshot.from_entries(
+        np.concatenate((rows[keep], row_target[rows[copied]])),
+        np.concatenate((snapshot.group_index[keep], group_map[snapshot.group_index[copied]])),
+        np.concatenate((snapshot.weight[keep], snapshot.weight[copied])),
+        snapshot.vert_count,
+        snapshot.group_count,
+    )
+
+
+def find_empty_vertex_groups(obj):
+    """回傳沒有任何非零權重的頂點群組索引"""
+    snapshot = read_weights(obj)
+    used = np.zeros(snapshot.group_count, dtype=bool)
+    groups = snapshot.group_index[snapshot.weight > 0.0]
+    used[groups[groups < snapshot.group_count]] = True
+    return np.flatnonzero(~used).tolist()
+
+
+def set_vertex_weight(obj, group_index, weight, selected=None, mirror_axis=None, mirror_tolerance=1e-4):
+    """設定頂點權重並歸一化其他群組，不需要運算符或 context，編輯模式與物件模式皆可使用
+
+    selected 為頂點遮罩，None 表示使用目前選取的頂點；mirror_axis 為 'X'、'Y'、'Z' 時
+    同時套用到未選取的鏡像頂點。回傳 (設定的頂點數, 鏡像的頂點數)。
+    """
+    if selected is None:
+        with phase("extract"):
+            selected = selected_vertex_mask(obj)
+
+    # 以權重快照一次計算所有選取頂點，再只寫回有變動的項目
+    with phase("extract"):
+        snapshot = read_weights(obj)
+    with phase("compute"):
+        snapshot = set_weight_normalized(snapshot, selected, group_index, weight)
+
+    mirrored_count = 0
+    if mirror_axis is not None:
+        with phase("mirror_map"):
+            mapping = mirror_map(obj, ("XYZ".index(mirror_axis),), mirror_tolerance)
+        with phase("compute"):
+            # 選取的頂點保留直接設定的結果，只複製到未選取的鏡像頂點
+            source = np.flatnonzero(selected & (mapping >= 0))
+            target = mapping[source]
+            outside = ~selected[target]
+            source, target = unique_pairs(source[outside], target[outside])
+            snapshot = mirror_weights(snapshot, source, target, mirror_group_indices(obj))
+            mirrored_count = len(target)
+
+    with phase("write_back"):
+        write_weights(obj, snapshot)
+    return int(selected.sum()), mirrored_count
+
+
+def clean_weights(snapshot, locked, max_influences=0, epsilon=0.0, quantize_bits=0, normalize=True):
+    """在一次向量化處理中整理所有頂點的權重，鎖定群組的權重不會被修改或刪除
+
+    依序：每個頂點只保留最大的 max_influences 個影響（0 為不限制）、刪除小於 epsilon 的權重、
+    歸一化使總和為 1（扣除鎖定群組的權重）、量化為 quantize_bits 位元（0 為不量化）。
+    歸一化時先量化再把誤差補到小數部分最大的項目，讓每個頂點的總和仍然精確。
+    回傳 (新的快照, 統計數量)。
+    """
+    rows = snapshot.rows()
+    group_index = snapshot.group_index
+    weight = snapshot.weight.astype(np.float64)
+    # 群組索引超出 locked 範圍時視為未鎖定
+    is_locked = np.zeros(len(group_index), dtype=bool)
+    in_range = group_index < len(locked)
+    is_locked[in_range] = np.asarray(locked, dtype=bool)[group_index[in_range]]
+    keep = np.ones(len(group_index), dtype=bool)
+    stats = {"limited": 0, "below_epsilon": 0, "quantized_to_zero": 0, "normalized_vertices": 0}
+
+    if max_influences > 0:
+        # 每個頂點內依（鎖定優先、權重由大到小）排序，排名超過上限的未鎖定項目刪除
+        order = np.lexsort((-weight, ~is_locked, rows))
+        sorted_rows = rows[order]
+        rank = np.arange(len(order)) - np.searchsorted(sorted_rows, sorted_rows)
+        limited = order[(rank >= max_influences) & ~is_locked[order]]
+        keep[limited] = False
+        stats["limited"] = len(limited)
+
+    if epsilon > 0:
+        below = keep & ~is_locked & (weight < epsilon)
+        keep &= ~below
+        stats["below_epsilon"] = int(below.sum())
+
+    free = keep & ~is_locked
+    locked_total = np.bincount(rows[keep & is_locked], weights=weight[keep & is_locked], minlength=snapshot.vert_count)
+    free_total = np.bincount(rows[free], weights=weight[free], minlength=snapshot.vert_count)
+    remaining = np.clip(1.0 - locked_total, 0.0, 1.0)
+
+    if normalize:
+        valid = free_total > 0
+        scale = np.ones(snapshot.vert_count)
+        scale[valid] = remaining[valid] / free_total[valid]
+        weight[free] *= scale[rows[free]]
+        stats["normalized_vertices"] = int((valid & ~np.isclose(free_total, remaining)).sum())
+
+    if quantize_bits > 0:
+        levels = (1 << quantize_bits) - 1
+        indices = np.flatnonzero(free)
+        scaled = weight[indices] * levels
+        if normalize:
+            units = np.floor(scaled + 1e-9)
+            free_rows = rows[indices]
+            # 每個頂點還差幾個量化單位，依小數部分由大到小補上
+            target_units = np.rint(remaining * levels)
+            deficit = target_units - np.bincount(free_rows, weights=units, minlength=snapshot.vert_count)
+            order = np.lexsort((-(scaled - units), free_rows))
+            sorted_rows = free_rows[order]
+            rank = np.arange(len(order)) - np.searchsorted(sorted_rows, sorted_rows)
+            units[order[rank < deficit[sorted_rows]]] += 1
+        else:
+            units = np.rint(scaled)
+        weight[indices] = units / levels
+        zero = indices[units == 0]
+        keep[zero] = False
+        stats["quantized_to_zero"] = len(zero)
+
+    weight = np.clip(weight, 0.0, 1.0)
+    return WeightSnapshot.from_entries(
+        rows[keep], group_index[keep], weight[keep], snapshot.vert_count, snapshot.group_count
+    ), stats
+
+
+def remove_empty_vertex_groups(obj, keep_locked=False):
+    """刪除物件中沒有任何非零權重的頂點群組，回傳刪除的群組名稱"""
+    empty_indices = find_empty_vertex_groups(obj)
+    vertex_groups = obj.vertex_groups
+    if keep_locked:
+        empty_indices = [index for index in empty_indices if not vertex_groups[index].lock_weight]
+    if not empty_indices:
+        return []
+
+    # 由高索引往低索引刪除，避免刪除後索引位移
+    names = [vertex_groups[index].name for index in empty_indices]
+    for index in reversed(empty_indices):
+        vertex_groups.remove(vertex_groups[index])
+    # 刪除群組後其餘群組索引會位移，快照需重新讀取
+    invalidate_weights(obj)
+    return names
+
+
+def _drop_weights(updated, geometry):
+    """幾何資料更新時清除對應的權重快照
+
+    write_weights 寫入後快照已是最新的，由寫入本身觸發的更新只消耗一次記錄，不清除快照。
+    """
+    stale = geometry - _own_writes
+    _own_writes.clear()
+    for key in [key for key in _weight_snapshots if key[0] in stale]:
+        del _weight_snapshots[key]
+
+
+class SetWeightOperator(bpy.types.Operator):
+    """設定選取頂點的權重並歸一化其他頂點群組權重"""
+    bl_idname = "object.set_vertex_weight_extended"
+    bl_label = "設定頂點權重"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    weight: bpy.props.FloatProperty(
+        name="Weight",
+        default=1.0,
+        min=0.0,
+        max=1.0,
+        description="要設定的權重值"
+    )
+    mirror: bpy.props.BoolProperty(
+        name="鏡像",
+        default=False,
+        description="同時將權重套用到鏡像位置的頂點，左右群組名稱互換（例如 .L 與 .R）"
+    )
+    mirror_axis: bpy.props.EnumProperty(
+        name="鏡像軸",
+        items=[
+            ('X', "X", "沿 X 軸鏡像"),
+            ('Y', "Y", "沿 Y 軸鏡像"),
+            ('Z', "Z", "沿 Z 軸鏡像"),
+        ],
+        default='X'
+    )
+    mirror_tolerance: bpy.props.FloatProperty(
+        name="鏡像容許誤差",
+        default=1e-4,
+        min=0.0,
+        precision=5,
+        description="鏡像位置與頂點的最大距離"
+    )
+
+    @profiled
+    def execute(self, context):
+        obj = context.active_object
+
+        if obj is None or obj.type != 'MESH':
+            self.report({'ERROR'}, "活躍物件不是網格類型")
+            return {'CANCELLED'}
+
+        if not obj.vertex_groups.active:
+            self.report({'ERROR'}, "沒有選取的頂點群組")
+            return {'CANCELLED'}
+
+        vg = obj.vertex_groups.active
+
+        if obj.mode != 'EDIT':
+            self.report({'ERROR'}, "請進入編輯模式")
+            return {'CANCELLED'}
+
+        with phase("extract"):
+            selected = selected_vertex_mask(obj)
+
+        if not selected.any():
+            self.report({'ERROR'}, "沒有選取頂點")
+            return {'CANCELLED'}
+
+        _, mirrored_count = set_vertex_weight(
+            obj, vg.index, self.weight, selected,
+            mirror_axis=self.mirror_axis if self.mirror else None,
+            mirror_tolerance=self.mirror_tolerance,
+        )
+
+        message = f"設置了 {int(selected.sum())} 個頂點的權重為 {self.weight}"
+        if self.mirror:
+            message += f"，鏡像 {mirrored_count} 個頂點"
+        self.report({'INFO'}, message)
+        return {'FINISHED'}
+
+
+class FalloffWeightOperator(bpy.types.Operator):
+    """依與活躍頂點、3D 游標或軸向平面的距離設定選取頂點的漸變權重，並歸一化其他頂點群組權重"""
+    bl_idname = "object.set_vertex_weight_falloff"
+    bl_label = "漸變權重"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    origin: bpy.props.EnumProperty(
+        name="距離起點",
+        items=[
+            ('ACTIVE', "活躍頂點", "與最後選取的頂點的距離"),
+            ('CURSOR', "3D 游標", "與 3D 游標的距離"),
+            ('PLANE', "軸向平面", "與通過 3D 游標、垂直於全域軸向的平面的距離"),
+        ],
+        default='ACTIVE'
+    )
+    axis: bpy.props.EnumProperty(
+        name="軸向",
+        items=[
+            ('X', "X", "垂直於 X 軸的平面"),
+            ('Y', "Y", "垂直於 Y 軸的平面"),
+            ('Z', "Z", "垂直於 Z 軸的平面"),
+        ],
+        default='X'
+    )
+    falloff: bpy.props.EnumProperty(
+        name="衰減",
+        items=[
+            ('LINEAR', "線性", "權重隨距離線性變化"),
+            ('SMOOTH', "平滑", "兩端變化較緩的平滑曲線"),
+            ('CURVE', "自訂曲線", "依自訂曲線的取樣值內插"),
+        ],
+        default='LINEAR'
+    )
+    curve: bpy.props.FloatVectorProperty(
+        name="自訂曲線",
+        description="由距離 0 到半徑均勻取樣的衰減值，1 為起始權重、0 為結束權重",
+        size=5,
+        min=0.0,
+        max=1.0,
+        default=(1.0, 0.75, 0.5, 0.25, 0.0)
+    )
+    radius: bpy.props.FloatProperty(
+        name="半徑",
+        description="權重到達結束權重的距離，0 表示使用選取頂點的最大距離",
+        default=0.0,
+        min=0.0,
+        subtype='DISTANCE'
+    )
+    start_weight: bpy.props.FloatProperty(
+        name="起始權重",
+        default=1.0,
+        min=0.0,
+        max=1.0
+    )
+    end_weight: bpy.props.FloatProperty(
+        name="結束權重",
+        default=0.0,
+        min=0.0,
+        max=1.0
+    )
+
+    @profiled
+    def execute(self, context):
+        obj = context.active_object
+
+        if obj is None or obj.type != 'MESH':
+            self.report({'ERROR'}, "活躍物件不是網格類型")
+            return {'CANCELLED'}
+
+        vg = obj.vertex_groups.active
+        if vg is None:
+            self.report({'ERROR'}, "沒有選取的頂點群組")
+            return {'CANCELLED'}
+
+        if obj.mode != 'EDIT':
+            self.report({'ERROR'}, "請進入編輯模式")
+            return {'CANCELLED'}
+
+        with phase("extract"):
+            selected = selected_vertex_mask(obj)
+        if not selected.any():
+            self.report({'ERROR'}, "沒有選取頂點")
+            return {'CANCELLED'}
+
+        if self.origin == 'ACTIVE':
+            bm = bmesh.from_edit_mesh(obj.data)
+            active = bm.select_history.active
+            if not isinstance(active, bmesh.types.BMVert):
+                self.report({'ERROR'}, "沒有活躍頂點")
+                return {'CANCELLED'}
+            bm.verts.index_update()
+            active_index = active.index
+
+        with phase("extract"):
+            # 直接讀取編輯中的 BMesh，同步網格資料會標記幾何更新並清除權重快照
+            coords = edit_vertex_coordinates(obj)
+            snapshot = read_weights(obj)
+
+        with phase("compute"):
+            # 距離以全域座標計算，半徑不受物件縮放影響
+            matrix = np.array(obj.matrix_world, dtype=np.float64)
+            indices = np.flatnonzero(selected)
+            points = coords[indices] @ matrix[:3, :3].T + matrix[:3, 3]
+            cursor = np.array(context.scene.cursor.location, dtype=np.float64)
+            if self.origin == 'ACTIVE':
+                origin = matrix[:3, :3] @ coords[active_index] + matrix[:3, 3]
+                distance = np.linalg.norm(points - origin, axis=1)
+            elif self.origin == 'CURSOR':
+                distance = np.linalg.norm(points - cursor, axis=1)
+            else:
+                axis = "XYZ".index(self.axis)
+                distance = np.abs(points[:, axis] - cursor[axis])
+
+            radius = self.radius or float(distance.max(initial=0.0))
+            target_weight = np.zeros(snapshot.vert_count, dtype=np.float32)
+            target_weight[indices] = falloff_weights(
+                distance, radius, self.falloff, self.start_weight, self.end_weight, self.curve
+            )
+            snapshot = set_weight_normalized(snapshot, selected, vg.index, target_weight)
+
+        with phase("write_back"):
+            write_weights(obj, snapshot)
+
+        self.report({'INFO'}, f"設置了 {len(indices)} 個頂點的漸變權重")
+        return {'FINISHED'}
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "origin")
+        if self.origin == 'PLANE':
+            layout.prop(self, "axis")
+        layout.prop(self, "falloff")
+        if self.falloff == 'CURVE':
+            layout.prop(self, "curve")
+        layout.prop(self, "radius")
+        layout.prop(self, "start_weight")
+        layout.prop(self, "end_weight")
+
+
+class CleanWeightsOperator(bpy.types.Operator):
+    """一次整理所選網格物件的權重：限制影響數、刪除過小權重、量化、歸一化並刪除空白群組"""
+    bl_idname = "object.clean_vertex_weights"
+    bl_label = "整理權重"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    max_influences: bpy.props.IntProperty(
+        name="最大影響數",
+        description="每個頂點最多保留幾個群組（權重由大到小），0 為不限制",
+        default=4,
+        min=0,
+        max=32
+    )
+    epsilon: bpy.props.FloatProperty(
+        name="最小權重",
+        description="刪除小於此值的權重",
+        default=0.001,
+        min=0.0,
+        max=1.0,
+        precision=4
+    )
+    quantize_bits: bpy.props.IntProperty(
+        name="量化位元數",
+        description="將權重量化為 2^N - 1 階，0 為不量化",
+        default=0,
+        min=0,
+        max=16
+    )
+    normalize: bpy.props.BoolProperty(
+        name="歸一化",
+        description="使每個頂點的權重總和為 1，鎖定群組的權重保持不變",
+        default=True
+    )
+    remove_empty: bpy.props.BoolProperty(
+        name="刪除空白群組",
+        description="整理後刪除沒有任何權重的群組（鎖定群組除外）",
+        default=True
+    )
+
+    @profiled
+    def execute(self, context):
+        from concurrent.futures import ThreadPoolExecutor
+
+        if context.mode == 'EDIT_MESH':
+            objects = [obj for obj in context.objects_in_mode if obj.type == 'MESH']
+        else:
+            objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
+        objects = [obj for obj in objects if obj.vertex_groups]
+        if not objects:
+            self.report({'ERROR'}, "沒有選取含頂點群組的網格物件")
+            return {'CANCELLED'}
+
+        timings = {}
+        start = time.perf_counter()
+        with phase("extract"):
+            snapshots = [read_weights(obj) for obj in objects]
+            locked = [np.array([vg.lock_weight for vg in obj.vertex_groups], dtype=bool) for obj in objects]
+        timings["讀取"] = time.perf_counter() - start
+
+        # 計算只使用 NumPy（大部分運算會釋放 GIL），各物件平行處理；讀寫 Blender 資料仍在主執行緒，
+        # 運算符屬性也先在主執行緒讀出
+        clean = functools.partial(clean_weights, max_influences=self.max_influences, epsilon=self.epsilon,
+                                  quantize_bits=self.quantize_bits, normalize=self.normalize)
+        start = time.perf_counter()
+        with phase("compute"):
+            with ThreadPoolExecutor(max_workers=min(len(objects), os.cpu_count() or 1)) as executor:
+                results = list(executor.map(clean, snapshots, locked))
+        timings["計算"] = time.perf_counter() - start
+
+        totals = {"limited": 0, "below_epsilon": 0, "quantized_to_zero": 0, "normalized_vertices": 0,
+                  "written": 0, "removed": 0, "groups": 0}
+        start = time.perf_counter()
+        with phase("write_back"):
+            for obj, (snapshot, stats) in zip(objects, results):
+                for key, value in stats.items():
+                    totals[key] += value
+                written, removed = write_weights(obj, snapshot)
+                totals["written"] += written
+                totals["removed"] += removed
+                if self.remove_empty:
+                    totals["groups"] += len(remove_empty_vertex_groups(obj, keep_locked=True))
+        timings["寫回"] = time.perf_counter() - start
+
+        self.report({'INFO'}, (
+            f"整理了 {len(objects)} 個物件："
+            f"限制影響數刪除 {totals['limited']} 項、過小權重刪除 {totals['below_epsilon']} 項、"
+            f"量化為 0 刪除 {totals['quantized_to_zero']} 項、歸一化 {totals['normalized_vertices']} 個頂點、"
+            f"寫入 {totals['written']} 項、刪除 {totals['removed']} 項、刪除 {totals['groups']} 個空白群組；"
+            + "、".join(f"{name} {elapsed * 1000:.1f} ms" for name, elapsed in timings.items())
+        ))
+        return {'FINISHED'}
+
+
+class DeleteEmptyVertexGroupsOperator(bpy.types.Operator):
+    """刪除所選網格物件中的空白頂點群組"""
+    bl_idname = "object.delete_empty_vertex_groups"
+    bl_label = "刪除空白頂點群組"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @profiled
+    def execute(self, context):
+        selected_objects = context.selected_objects
+        if not selected_objects:
+            self.report({'ERROR'}, "沒有選取物件")
+            return {'CANCELLED'}
+
+        deleted_groups = []
+
+        for obj in selected_objects:
+            if obj.type != 'MESH':
+                continue
+
+            with phase("write_back"):
+                names = remove_empty_vertex_groups(obj)
+            deleted_groups.extend((obj.name, name) for name in names)
+
+        if deleted_groups:
+            message = "刪除空白頂點群組:\n"
+            for obj_name, group_name in deleted_groups:
+                message += f"- {obj_name}: {group_name}\n"
+            self.report({'INFO'}, message)
+        else:
+            self.report({'INFO'}, "沒有找到空白的頂點群組。")
+
+        return {'FINISHED'}
+
+
+class VertexWeightPanel(bpy.types.Panel):
+    """在3D視窗的側邊欄 Item 標籤下創建一個頂點權重面板"""
+    bl_label = "頂點權重工具"
+    bl_idname = "VIEW3D_PT_vertex_weight_tool_extended"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Item"
+
+    @profiled
+    def draw(self, context):
+        layout = self.layout
+        obj = context.object
+
+        if obj and obj.type == 'MESH' and obj.mode == 'EDIT':
+            if obj.vertex_groups.active:
+                layout.label(text="頂點權重設定:")
+                mirror = context.scene.vertex_weight_mirror
+                layout.prop(context.scene, "vertex_weight_mirror")
+
+                # 上方兩個按鈕：0 和 1
+                row = layout.row(align=True)
+                for w in (0.0, 1.0):
+                    op = row.operator("object.set_vertex_weight_extended", text=f"{w:.0f}")
+                    op.weight = w
+                    op.mirror = mirror
+
+                layout.separator()
+
+                # 下方按鈕：0.1 到 0.9
+                row = layout.row(align=True)
+                for w in [0.1 * j for j in range(1, 10)]:
+                    op = row.operator("object.set_vertex_weight_extended", text=f"{w:.1f}")
+                    op.weight = w
+                    op.mirror = mirror
+
+                layout.separator()
+                layout.operator("object.set_vertex_weight_falloff", text="漸變權重")
+
+            else:
+                layout.label(text="請選擇一個頂點群組")
+        else:
+            layout.label(text="請在編輯模式下選擇一個網格物件並選取頂點")
+
+
+class ToolkitPanel(bpy.types.Panel):
+    """在3D視窗的側邊欄 Item 標籤下創建一個工具包面板"""
+    bl_label = "工具包"
+    bl_idname = "VIEW3D_PT_toolkit"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Item"
+
+    @profiled
+    def draw(self, context):
+        layout = self.layout
+
+        layout.label(text="選取單個或多個網格物件")
+        layout.operator("object.delete_empty_vertex_groups", text="刪除空白頂點群組")
+        layout.operator("object.clean_vertex_weights", text="整理權重")
+
+
+def register():
+    bpy.types.Scene.vertex_weight_mirror = bpy.props.BoolProperty(
+        name="X 鏡像",
+        description="設定權重時同時套用到 X 軸鏡像位置的頂點，左右群組名稱互換",
+        default=False
+    )
+    register_cache(invalidate_weights, _drop_weights)
+    bpy.utils.register_class(SetWeightOperator)
+    bpy.utils.register_class(FalloffWeightOperator)
+    bpy.utils.register_class(DeleteEmptyVertexGroupsOperator)
+    bpy.utils.register_class(CleanWeightsOperator)
+    bpy.utils.register_class(VertexWeightPanel)
+    bpy.utils.register_class(ToolkitPanel)
+
+
+def unregister():
+    bpy.utils.unregister_class(SetWeightOperator)
+    bpy.utils.unregister_class(FalloffWeightOperator)
+    bpy.utils.unregister_class(DeleteEmptyVertexGroupsOperator)
+    bpy.utils.unregister_class(CleanWeightsOperator)
+    bpy.utils.unregister_class(VertexWeightPanel)
+    bpy.utils.unregister_class(ToolkitPanel)
+    unregister_cache(invalidate_weights)
+    del bpy.types.Scene.vertex_weight_mirror
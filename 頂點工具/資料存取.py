@@ -0,0 +1,445 @@
+"""網格、曲線與骨架元素的陣列讀寫
+
+各工具共用的資料存取層：座標、選取與隱藏狀態一律以 foreach_get/foreach_set
+一次讀寫為 NumPy 陣列，不逐元素存取。
+"""
+import contextlib
+import itertools
+import operator
+
+import bmesh
+import bpy
+from bpy.app.handlers import persistent
+
+from .延遲匯入 import np
+from .效能分析 import phase
+
+# 變形後座標快取：物件位址 -> (N, 3) 陣列，物件重新評估時由 depsgraph 處理器清除
+_evaluated_cache = {}
+# 以 register_cache 登記的快取：(clear_all, on_update)
+_caches = []
+
+
+# 通用
+def read_vectors(collection, attribute, width=3):
+    """以 foreach_get 讀取集合中所有元素的向量屬性，回傳 (N, width) 陣列"""
+    data = np.empty(len(collection) * width, dtype=np.float32)
+    collection.foreach_get(attribute, data)
+    return data.reshape(-1, width)
+
+
+def read_flags(collection, attribute):
+    """以 foreach_get 讀取集合中所有元素的布林屬性（select、hide 等）"""
+    data = np.empty(len(collection), dtype=bool)
+    collection.foreach_get(attribute, data)
+    return data
+
+
+def read_matrices(collection, attribute):
+    """以 foreach_get 讀取集合中所有元素的 4x4 矩陣屬性（Blender 以行優先順序存放，需轉置）"""
+    data = np.empty(len(collection) * 16, dtype=np.float32)
+    collection.foreach_get(attribute, data)
+    return data.reshape(-1, 4, 4).transpose(0, 2, 1).astype(np.float64)
+
+
+def transform_coords(coords, matrix):
+    """以 4x4 矩陣一次轉換 (N, 3) 座標陣列"""
+    matrix = np.array(matrix, dtype=np.float64)
+    return coords @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+@contextlib.contextmanager
+def batched_object_mode(context, enabled=True):
+    """網格與曲線需在物件模式下批次讀寫，所有編輯中的物件共用同一次模式切換
+
+    mode_set 會同時轉換所有編輯中的物件，逐物件切換的成本是 N 倍。
+    """
+    switch_mode = enabled and context.mode in {'EDIT_MESH', 'EDIT_CURVE'}
+    if switch_mode:
+        with phase("mode_set"):
+            bpy.ops.object.mode_set(mode='OBJECT')
+    try:
+        yield
+    finally:
+        if switch_mode:
+            with phase("mode_set"):
+                bpy.ops.object.mode_set(mode='EDIT')
+
+
+# 網格
+def mesh_coordinates(obj):
+    """以 foreach_get 讀取所有頂點的區域座標，編輯模式下先同步網格資料"""
+    if obj.mode == 'EDIT':
+        obj.update_from_editmode()
+    return read_vectors(obj.data.vertices, "co")
+
+
+def selected_vertex_mask(obj):
+    """回傳選取頂點的布林遮罩，編輯模式下直接讀取編輯中的 BMesh，不同步網格資料"""
+    if obj.mode == 'EDIT':
+        return edit_vertex_mask(obj)
+    return read_flags(obj.data.vertices, "select")
+
+
+def edit_vertex_mask(obj):
+    """讀取編輯中 BMesh 的頂點選取遮罩，不將編輯網格同步回網格資料
+
+    update_from_editmode 會標記幾何更新，使修改器重新評估並清除依物件保存的快取；
+    只需要選取狀態時直接讀 BMesh 的旗標（以 map/attrgetter 迭代，不經過 Python 迴圈主體）。
+    """
+    verts = bmesh.from_edit_mesh(obj.data).verts
+    return np.fromiter(map(operator.attrgetter("select"), verts), dtype=bool, count=len(verts))
+
+
+def edit_vertex_coordinates(obj):
+    """讀取編輯中 BMesh 所有頂點的區域座標，不同步網格資料（理由同 edit_vertex_mask）"""
+    verts = bmesh.from_edit_mesh(obj.data).verts
+    coords = itertools.chain.from_iterable(map(operator.attrgetter("co"), verts))
+    return np.fromiter(coords, dtype=np.float32, count=len(verts) * 3).reshape(-1, 3)
+
+
+def write_mesh_selection(mesh, vert_select):
+    """寫入頂點選取，並依頂點推導邊與面的選取（需在物件模式下呼叫）"""
+    with phase("extract"):
+        edge_verts = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+        mesh.edges.foreach_get("vertices", edge_verts)
+        loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_verts)
+        loop_starts = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("loop_start", loop_starts)
+
+    with phase("compute"):
+        # 邊：兩端頂點皆被選取時才選取
+        edge_select = vert_select[edge_verts].reshape(-1, 2).all(axis=1)
+        # 面：所有角落頂點皆被選取時才選取
+        if len(loop_starts):
+            face_select = np.logical_and.reduceat(vert_select[loop_verts], loop_starts)
+
+    with phase("write_back"):
+        mesh.vertices.foreach_set("select", vert_select)
+        mesh.edges.foreach_set("select", edge_select)
+        if len(loop_starts):
+            mesh.polygons.foreach_set("select", face_select)
+
+
+def evaluated_coordinates(obj, depsgraph):
+    """以 foreach_get 讀取物件評估後（修改器、形態鍵、骨架變形之後）網格的區域座標
+
+    結果依物件快取，物件或其依賴（例如骨架姿勢）更新而重新評估之前都重複使用，
+    不會每次複製都重新計算修改器堆疊。
+    """
+    key = obj.as_pointer()
+    coords = _evaluated_cache.get(key)
+    if coords is None:
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = evaluated.to_mesh()
+        try:
+            coords = read_vectors(mesh.vertices, "co")
+        finally:
+            evaluated.to_mesh_clear()
+        _evaluated_cache[key] = coords
+    return coords
+
+
+def invalidate_evaluated(obj=None):
+    """清除指定物件（或全部）的變形後座標"""
+    if obj is None:
+        _evaluated_cache.clear()
+    else:
+        _evaluated_cache.pop(obj.as_pointer(), None)
+
+
+# 曲線
+def split_splines(curve):
+    """回傳 (Bezier 曲線, 其他曲線)，遮罩中先排 Bezier 控制點再排其他控制點"""
+    bezier_splines = [spline for spline in curve.splines if spline.type == 'BEZIER']
+    other_splines = [spline for spline in curve.splines if spline.type != 'BEZIER']
+    return bezier_splines, other_splines
+
+
+def gather_spline_points(splines, collection, attribute, width, dtype="float32"):
+    """將多條曲線同一個控制點屬性以 foreach_get 讀入同一個陣列
+
+    回傳 (陣列, 每條曲線在陣列中的起點)，width 為每個控制點的數值個數。
+    """
+    counts = [len(getattr(spline, collection)) for spline in splines]
+    offsets = np.zeros(len(splines) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    data = np.empty(int(offsets[-1]) * width, dtype=dtype)
+    for spline, start, end in zip(splines, offsets[:-1].tolist(), offsets[1:].tolist()):
+        getattr(spline, collection).foreach_get(attribute, data[start * width:end * width])
+    return (data.reshape(-1, width) if width > 1 else data), offsets
+
+
+def scatter_spline_points(splines, collection, attribute, data, offsets):
+    """將 gather_spline_points 格式的陣列以 foreach_set 寫回各條曲線"""
+    for spline, start, end in zip(splines, offsets[:-1].tolist(), offsets[1:].tolist()):
+        getattr(spline, collection).foreach_set(attribute, data[start:end].ravel())
+
+
+def spline_selection(spline):
+    """以 foreach_get 讀取曲線控制點，回傳 ((N, 3) 區域座標, 選取遮罩)"""
+    if spline.type == 'BEZIER':
+        points = spline.bezier_points
+        return read_vectors(points, "co"), read_flags(points, "select_control_point")
+    # NURBS/Poly 控制點為 (x, y, z, w)，只取 xyz
+    points = spline.points
+    return read_vectors(points, "co", 4)[:, :3], read_flags(points, "select")
+
+
+# 骨架
+def bone_selection(obj, mode):
+    """回傳 (骨骼集合, 選取遮罩)，編輯模式為 edit_bones，姿勢模式為 pose.bones"""
+    if mode == 'EDIT_ARMATURE':
+        bones = obj.data.edit_bones
+        return bones, read_flags(bones, "select") & ~read_flags(bones, "hide")
+    # 姿勢骨骼的選取狀態存放在對應的 Bone 上，無法直接以 foreach_get 依 pose.bones 順序讀取
+    bones = obj.pose.bones
+    select = np.fromiter((bone.bone.select and not bone.bone.hide for bone in bones), dtype=bool, count=len(bones))
+    return bones, select
+
+
+def write_edit_bone_heads(obj, select, targets):
+    """一次寫入選取編輯骨骼的頭部座標，並維持與父骨骼的連接"""
+    bones = obj.data.edit_bones
+    heads = read_vectors(bones, "head")
+    heads[select] = targets
+    bones.foreach_set("head", heads.ravel())
+
+    # foreach_set 不會觸發 RNA 更新，連接的骨骼需手動將父骨骼尾端移到新的頭部
+    connected = read_flags(bones, "use_connect")
+    for index in np.flatnonzero(select & connected).tolist():
+        bone = bones[index]
+        bone.parent.tail = bone.head
+
+
+def write_pose_bone_heads(obj, select, targets):
+    """移動選取的姿勢骨骼，使骨骼頭部（骨架空間）位於 targets
+
+    姿勢矩陣 matrix = P @ matrix_basis，頭部位置為 P[:3, :3] @ location + P[:3, 3]，
+    因此可由 P 一次解出所有骨骼的 location。父子骨骼同時被選取時，
+    父骨骼移動會改變子骨骼的 P，所以依選取的祖先數由上而下分層處理。
+    """
+    bones = obj.pose.bones
+    indices = np.flatnonzero(select)
+    targets = np.broadcast_to(np.asarray(targets, dtype=np.float64), (len(indices), 3))
+
+    selected_names = {bones[index].name for index in indices.tolist()}
+    depth = np.array([
+        sum(1 for parent in bones[index].parent_recursive if parent.name in selected_names)
+        for index in indices.tolist()
+    ], dtype=np.int64)
+
+    for level in np.unique(depth).tolist():
+        if level:
+            # 取得上一層移動後的姿勢矩陣
+            bpy.context.view_layer.update()
+        members = depth == level
+        rows = indices[members]
+        parent_space = read_matrices(bones, "matrix")[rows] @ np.linalg.inv(read_matrices(bones, "matrix_basis")[rows])
+        offset = targets[members] - parent_space[:, :3, 3]
+        locations = read_vectors(bones, "location")
+        locations[rows] = np.linalg.solve(parent_space[:, :3, :3], offset[..., None])[..., 0]
+        bones.foreach_set("location", locations.ravel())
+        obj.update_tag()
+
+
+# 選取元素（依物件類型與模式）
+def count_selected(obj, mode):
+    """回傳物件在目前模式下選取的頂點/控制點/骨骼數量"""
+    if obj.type == 'MESH' and mode == 'EDIT_MESH':
+        return obj.data.total_vert_sel
+    elif obj.type == 'CURVE' and mode == 'EDIT_CURVE':
+        return sum(int(spline_selection(spline)[1].sum()) for spline in obj.data.splines)
+    elif obj.type == 'ARMATURE' and mode in {'EDIT_ARMATURE', 'POSE'}:
+        return int(bone_selection(obj, mode)[1].sum())
+    return 0
+
+
+def selected_coordinates(obj, mode, depsgraph=None):
+    """讀取物件選取元素依索引順序排列的區域座標，回傳 ((N, 3) 陣列, 錯誤訊息)
+
+    指定 depsgraph 時網格改為讀取評估後的座標，其他類型不受影響。
+    """
+    if obj.type == 'MESH' and mode == 'EDIT_MESH':
+        if obj.data.total_vert_sel == 0:
+            return None, "未選取任何頂點"
+        if depsgraph is not None:
+            # 編輯模式下的評估結果來自 BMesh，不同步編輯網格，否則每次複製都會使快取失效
+            select = edit_vertex_mask(obj)
+            coords = evaluated_coordinates(obj, depsgraph)
+            # 只有變形類修改器時評估後頂點與原始頂點索引一一對應
+            if len(coords) != len(select):
+                return None, "修改器改變了頂點數量，無法對應選取的頂點"
+            return coords[select], None
+        # 將編輯網格同步回網格資料後以 foreach_get 一次讀取
+        obj.update_from_editmode()
+        vertices = obj.data.vertices
+        return read_vectors(vertices, "co")[read_flags(vertices, "select")], None
+    elif obj.type == 'CURVE' and mode == 'EDIT_CURVE':
+        selected = [coords[select] for coords, select in map(spline_selection, obj.data.splines)]
+        coords = np.concatenate(selected) if selected else np.empty((0, 3), dtype=np.float32)
+        if not len(coords):
+            return None, "未選取任何控制點"
+        return coords, None
+    elif obj.type == 'ARMATURE' and mode in {'EDIT_ARMATURE', 'POSE'}:
+        bones, select = bone_selection(obj, mode)
+        if not select.any():
+            return None, "未選取任何骨骼"
+        return read_vectors(bones, "head")[select], None
+    return None, "目前物件類型或模式不支援"
+
+
+def write_selected_coordinates(obj, mode, coords):
+    """將區域座標依索引順序寫入物件選取的元素，回傳寫入的元素數量
+
+    coords 可為 (N, 3) 陣列逐一對應，或單一 (3,) 座標寫入所有選取元素。
+    網格直接寫入編輯中的 BMesh：離開編輯模式時座標會寫回作用中的形態鍵，
+    若改在物件模式下寫入 mesh.vertices，有形態鍵的網格重新進入編輯模式時會被形態鍵覆蓋，
+    且每次貼上都要來回轉換整個網格兩次。
+    """
+    coords = np.asarray(coords, dtype=np.float32)
+    count = 0
+    if obj.type == 'MESH' and mode == 'EDIT_MESH':
+        bm = bmesh.from_edit_mesh(obj.data)
+        selected_verts = list(filter(operator.attrgetter("select"), bm.verts))
+        count = len(selected_verts)
+        for vert, co in zip(selected_verts, np.broadcast_to(coords, (count, 3)).tolist()):
+            vert.co = co
+        if count:
+            with phase("update_edit_mesh"):
+                bmesh.update_edit_mesh(obj.data)
+    elif obj.type == 'CURVE' and mode == 'EDIT_CURVE':
+        for spline in obj.data.splines:
+            spline_coords, select = spline_selection(spline)
+            selected = int(select.sum())
+            if not selected:
+                continue
+            block = coords[count:count + selected] if coords.ndim == 2 else coords
+            if spline.type == 'BEZIER':
+                points = spline.bezier_points
+                spline_coords = spline_coords.copy()
+                spline_coords[select] = block
+            else:
+                # NURBS 控制點為齊次座標，保留原本的 w
+                points = spline.points
+                spline_coords = read_vectors(points, "co", 4)
+                spline_coords[select, :3] = block
+            points.foreach_set("co", spline_coords.ravel())
+            count += selected
+        if count:
+            obj.data.update_tag()
+    elif obj.type == 'ARMATURE' and mode in {'EDIT_ARMATURE', 'POSE'}:
+        _, select = bone_selection(obj, mode)
+        count = int(select.sum())
+        if count and mode == 'EDIT_ARMATURE':
+            write_edit_bone_heads(obj, select, coords)
+        elif count:
+            write_pose_bone_heads(obj, select, coords)
+    invalidate_evaluated(obj)
+    return count
+
+
+def read_selection(obj):
+    """以 foreach_get 讀取頂點/控制點/骨骼的選取狀態（網格與曲線需在物件模式下呼叫）"""
+    if obj.type == 'MESH':
+        return read_flags(obj.data.vertices, "select")
+    if obj.type == 'CURVE':
+        bezier_splines, other_splines = split_splines(obj.data)
+        bezier_select, _ = gather_spline_points(bezier_splines, "bezier_points", "select_control_point", 1, bool)
+        other_select, _ = gather_spline_points(other_splines, "points", "select", 1, bool)
+        return np.concatenate((bezier_select, other_select))
+    return read_flags(obj.data.edit_bones, "select")
+
+
+def write_selection(obj, select):
+    """以 foreach_set 寫入 read_selection 格式的選取狀態，隱藏的元素不會被選取"""
+    if obj.type == 'MESH':
+        hidden = read_flags(obj.data.vertices, "hide")
+        write_mesh_selection(obj.data, select & ~hidden)
+    elif obj.type == 'CURVE':
+        bezier_splines, other_splines = split_splines(obj.data)
+        hidden, offsets = gather_spline_points(bezier_splines, "bezier_points", "hide", 1, bool)
+        bezier_select = select[:len(hidden)] & ~hidden
+        # 控制柄跟隨控制點
+        for attribute in ("select_control_point", "select_left_handle", "select_right_handle"):
+            scatter_spline_points(bezier_splines, "bezier_points", attribute, bezier_select, offsets)
+        other_hidden, other_offsets = gather_spline_points(other_splines, "points", "hide", 1, bool)
+        scatter_spline_points(other_splines, "points", "select", select[len(hidden):] & ~other_hidden, other_offsets)
+    else:
+        bones = obj.data.edit_bones
+        select = select & ~read_flags(bones, "hide")
+        for attribute in ("select", "select_head", "select_tail"):
+            bones.foreach_set(attribute, select)
+
+
+def _drop_evaluated(updated, geometry):
+    """物件重新評估時清除其變形後座標
+
+    骨架姿勢或形態鍵改變時，被變形的物件也會重新評估並出現在 updates 中。
+    """
+    for key in updated.intersection(_evaluated_cache):
+        del _evaluated_cache[key]
+
+
+# 快取清除
+def register_cache(clear_all, on_update=None):
+    """登記一個快取，復原/重做/開啟檔案與 depsgraph 更新的處理器由本模組統一註冊
+
+    復原、重做或開啟檔案時呼叫 clear_all()；depsgraph 更新時呼叫
+    on_update(updated, geometry)，updated 為有更新的 ID 位址，
+    geometry 為幾何有更新的資料位址（物件以其網格等資料代替）。
+    """
+    _caches.append((clear_all, on_update))
+
+
+def unregister_cache(clear_all):
+    """取消登記並清除快取"""
+    _caches[:] = [entry for entry in _caches if entry[0] != clear_all]
+    clear_all()
+
+
+@persistent
+def _on_depsgraph_update(scene, depsgraph):
+    callbacks = [on_update for _, on_update in _caches if on_update is not None]
+    if not callbacks:
+        return
+    updated = set()
+    geometry = set()
+    for update in depsgraph.updates:
+        original = update.id.original
+        updated.add(original.as_pointer())
+        if update.is_updated_geometry:
+            data = original.data if isinstance(original, bpy.types.Object) else original
+            if data is not None:
+                geometry.add(data.as_pointer())
+    for on_update in callbacks:
+        on_update(updated, geometry)
+
+
+@persistent
+def _on_reset(*args):
+    """復原、重做或開啟檔案時資料的位址可能被重複使用，清除所有快取"""
+    for clear_all, _ in _caches:
+        clear_all()
+
+
+_reset_handlers = (
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+    bpy.app.handlers.load_post,
+)
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+    for handlers in _reset_handlers:
+        handlers.append(_on_reset)
+    register_cache(invalidate_evaluated, _drop_evaluated)
+
+
+def unregister():
+    unregister_cache(invalidate_evaluated)
+    bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+    for handlers in _reset_handlers:
+        handlers.remove(_on_reset)
@@ -0,0 +1,1081 @@
+"""依照設定的軸向(XYZ)、區域或門檻平面選取頂點/控制點/骨骼，以及具名的選取遮罩"""
+import collections
+import itertools
+
+import bmesh
+import bpy
+from bpy.props import (
+    BoolProperty,
+    CollectionProperty,
+    EnumProperty,
+    FloatProperty,
+    FloatVectorProperty,
+    IntProperty,
+    StringProperty,
+)
+from mathutils import Vector
+
+from .延遲匯入 import np
+from .效能分析 import phase, profiled
+from .資料存取 import (
+    batched_object_mode,
+    gather_spline_points,
+    mesh_coordinates,
+    read_flags,
+    read_selection,
+    read_vectors,
+    scatter_spline_points,
+    split_splines,
+    transform_coords,
+    write_mesh_selection,
+    write_selection,
+)
+from .鏡像對應 import mirror_map
+
+
+# 區塊包圍盒相對於區域的狀態：完全在外、部分重疊、完全在內
+OUTSIDE, PARTIAL, INSIDE = 0, 1, 2
+# 大型網格以固定數量的連續頂點為一個區塊，整個區塊在區域內外時不需逐頂點判斷
+CHUNK_SIZE = 1 << 16
+
+
+def box_corners(low, high):
+    """回傳 (C, 3) 包圍盒的 (C, 8, 3) 角點"""
+    pick = np.array([[i & 1, (i >> 1) & 1, (i >> 2) & 1] for i in range(8)], dtype=bool)
+    return np.where(pick, high[:, None, :], low[:, None, :])
+
+
+def classify_box(corners, low, high):
+    """軸向包圍盒區域：角點全在盒內為 INSIDE，角點的包圍盒與區域不相交為 OUTSIDE"""
+    inside = ((corners >= low) & (corners <= high)).all(axis=(1, 2))
+    outside = ((corners.max(axis=1) < low) | (corners.min(axis=1) > high)).any(axis=1)
+    return np.where(inside, INSIDE, np.where(outside, OUTSIDE, PARTIAL))
+
+
+class PlanePredicate:
+    """半空間：normal · p >= offset"""
+    __slots__ = ("normal", "offset", "invert")
+
+    def __init__(self, normal, offset=0.0, invert=False):
+        self.normal = np.asarray(normal, dtype=np.float64)
+        self.offset = float(offset)
+        self.invert = invert
+
+    def contains(self, points):
+        return points @ self.normal >= self.offset
+
+    def classify(self, corners):
+        distance = corners @ self.normal - self.offset
+        return np.where((distance >= 0).all(axis=1), INSIDE, np.where((distance < 0).all(axis=1), OUTSIDE, PARTIAL))
+
+
+class BoxPredicate:
+    """軸向包圍盒：low <= p <= high"""
+    __slots__ = ("low", "high", "invert")
+
+    def __init__(self, low, high, invert=False):
+        self.low = np.asarray(low, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.invert = invert
+
+    def contains(self, points):
+        return ((points >= self.low) & (points <= self.high)).all(axis=1)
+
+    def classify(self, corners):
+        return classify_box(corners, self.low, self.high)
+
+
+class SpherePredicate:
+    """球體：|p - center| <= radius"""
+    __slots__ = ("center", "radius", "invert")
+
+    def __init__(self, center, radius, invert=False):
+        self.center = np.asarray(center, dtype=np.float64)
+        self.radius = float(radius)
+        self.invert = invert
+
+    def contains(self, points):
+        offset = points - self.center
+        return np.einsum("ij,ij->i", offset, offset) <= self.radius ** 2
+
+    def classify(self, corners):
+        radius_sq = self.radius ** 2
+        inside = (((corners - self.center) ** 2).sum(axis=2) <= radius_sq).all(axis=1)
+        # 球心到角點包圍盒的最近距離超過半徑時整個區塊在球外
+        nearest = np.clip(self.center, corners.min(axis=1), corners.max(axis=1))
+        outside = ((nearest - self.center) ** 2).sum(axis=1) > radius_sq
+        return np.where(inside, INSIDE, np.where(outside, OUTSIDE, PARTIAL))
+
+
+class BoundsPredicate:
+    """物件包圍盒：以 matrix 將座標轉換到該物件的區域座標後，判斷是否在 bound_box 內"""
+    __slots__ = ("matrix", "low", "high", "invert")
+
+    def __init__(self, matrix, low, high, invert=False):
+        self.matrix = np.asarray(matrix, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.invert = invert
+
+    @classmethod
+    def from_object(cls, region_obj, to_world=None, invert=False):
+        """to_world 為選取座標轉換到全域座標的矩陣，None 表示選取座標即為全域座標"""
+        matrix = np.linalg.inv(np.array(region_obj.matrix_world, dtype=np.float64))
+        if to_world is not None:
+            matrix = matrix @ np.array(to_world, dtype=np.float64)
+        bounds = np.array([tuple(corner) for corner in region_obj.bound_box], dtype=np.float64)
+        return cls(matrix, bounds.min(axis=0), bounds.max(axis=0), invert)
+
+    def contains(self, points):
+        local = transform_coords(points, self.matrix)
+        return ((local >= self.low) & (local <= self.high)).all(axis=1)
+
+    def classify(self, corners):
+        # 區塊包圍盒轉換後的角點仍圍住整個區塊（凸包），判斷結果保守但正確
+        local = transform_coords(corners.reshape(-1, 3), self.matrix).reshape(corners.shape)
+        return classify_box(local, self.low, self.high)
+
+
+class RegionQuery:
+    """以 AND（ALL）或 OR（ANY）組合多個區域條件，各條件可個別反轉（NOT）
+
+    RegionQuery 本身也可作為條件，巢狀組合出群組。
+    """
+    __slots__ = ("predicates", "combine", "invert")
+
+    def __init__(self, predicates, combine='ALL', invert=False):
+        self.predicates = list(predicates)
+        self.combine = combine
+        self.invert = invert
+
+    def contains(self, points):
+        masks = [predicate.contains(points) != predicate.invert for predicate in self.predicates]
+        if not masks:
+            return np.zeros(len(points), dtype=bool)
+        reduce = np.logical_and.reduce if self.combine == 'ALL' else np.logical_or.reduce
+        return reduce(masks)
+
+    def classify(self, corners):
+        # 三值邏輯：NOT 為 INSIDE - 狀態，AND 取最小值，OR 取最大值
+        states = [INSIDE - predicate.classify(corners) if predicate.invert else predicate.classify(corners)
+                  for predicate in self.predicates]
+        if not states:
+            return np.full(len(corners), OUTSIDE)
+        return np.minimum.reduce(states) if self.combine == 'ALL' else np.maximum.reduce(states)
+
+    def mask(self, coords, matrix=None, chunk_size=CHUNK_SIZE):
+        """回傳 (N, 3) 區域座標中符合條件的布林遮罩，matrix 為區域座標轉換到條件座標的矩陣
+
+        先以每個區塊的包圍盒分類，完全在內或在外的區塊直接填入結果，只有部分重疊的區塊逐點判斷。
+        """
+        count = len(coords)
+        result = np.zeros(count, dtype=bool)
+        if count == 0:
+            return result
+
+        starts = np.arange(0, count, chunk_size)
+        corners = box_corners(np.minimum.reduceat(coords, starts), np.maximum.reduceat(coords, starts))
+        if matrix is not None:
+            corners = transform_coords(corners.reshape(-1, 3), matrix).reshape(-1, 8, 3)
+        states = np.repeat(self.classify(corners), np.diff(np.append(starts, count)))
+
+        result[states == INSIDE] = True
+        partial = states == PARTIAL
+        if partial.any():
+            points = coords[partial]
+            if matrix is not None:
+                points = transform_coords(points, matrix)
+            result[partial] = self.contains(points)
+        return result
+
+
+def axis_query(axis_flags, is_positive):
+    """依軸向選取的條件：勾選的每個軸座標 >= 0（或 <= 0），以 AND 組合"""
+    sign = 1.0 if is_positive else -1.0
+    return RegionQuery([PlanePredicate(np.eye(3)[i] * sign) for i, flag in enumerate(axis_flags) if flag])
+
+
+def mesh_region_mask(mesh, query, matrix=None):
+    """回傳符合 query 且未隱藏的頂點遮罩（需在物件模式下呼叫）
+
+    matrix 為網格區域座標轉換到條件座標的矩陣，None 表示直接使用區域座標。
+    """
+    # 一次讀取所有頂點座標
+    with phase("extract"):
+        coords = read_vectors(mesh.vertices, "co")
+        hidden = read_flags(mesh.vertices, "hide")
+
+    with phase("compute"):
+        # 隱藏的頂點不會被選取，與 Blender 內建選取行為一致
+        return query.mask(coords, matrix) & ~hidden
+
+
+def select_mesh_region(mesh, query, matrix=None):
+    """以 query 選取網格頂點並回傳選取數量，不需要運算符或 context（需在物件模式下呼叫）"""
+    vert_select = mesh_region_mask(mesh, query, matrix)
+    write_mesh_selection(mesh, vert_select)
+    return int(vert_select.sum())
+
+
+# 選取遮罩：每個元素 1 位元，打包為 int32 陣列存放在物件資料的 ID 屬性
+MASKS_KEY = "vertex_tools_masks"
+
+# 遮罩運算直接作用在打包後的位元陣列上
+MASK_OPERATIONS = {
+    'SET': lambda destination, source: source,
+    'UNION': lambda destination, source: destination | source,
+    'INTERSECT': lambda destination, source: destination & source,
+    'SUBTRACT': lambda destination, source: destination & ~source,
+}
+
+
+def pack_mask(mask):
+    """將布林遮罩打包為 int32 陣列（每個元素 1 位元）"""
+    bits = np.packbits(np.asarray(mask, dtype=bool), bitorder='little')
+    padded = np.zeros(-(-len(bits) // 4) * 4, dtype=np.uint8)
+    padded[:len(bits)] = bits
+    return padded.view('<i4')
+
+
+def unpack_mask(words, count):
+    """將 pack_mask 的結果還原為長度 count 的布林遮罩"""
+    bits = np.ascontiguousarray(words, dtype='<i4').view(np.uint8)
+    return np.unpackbits(bits, count=count, bitorder='little').astype(bool)
+
+
+def mask_names(obj):
+    masks = obj.data.get(MASKS_KEY)
+    return sorted(masks.keys()) if masks is not None else []
+
+
+def load_mask(obj, name):
+    """回傳 (打包的遮罩, 元素數量)，不存在時回傳 None"""
+    masks = obj.data.get(MASKS_KEY)
+    if masks is None or name not in masks:
+        return None
+    entry = masks[name]
+    return np.array(entry["bits"], dtype='<i4'), int(entry["count"])
+
+
+def store_mask(obj, name, words, count):
+    """將打包的遮罩存入物件資料，會覆寫同名的遮罩"""
+    if obj.data.get(MASKS_KEY) is None:
+        obj.data[MASKS_KEY] = {}
+    obj.data[MASKS_KEY][name] = {"count": count, "bits": words.tolist()}
+
+
+def delete_mask(obj, name):
+    masks = obj.data.get(MASKS_KEY)
+    if masks is not None and name in masks:
+        del masks[name]
+
+
+class RegionSelectBase:
+    """依區域條件選取頂點/控制點/骨骼的共用流程，子類別的 execute() 以 select_region() 傳入條件"""
+
+    coord_mode: EnumProperty(
+        name="座標模式",
+        description="選擇座標系統模式",
+        items=[
+            ('LOCAL', "區域座標", "使用區域座標"),
+            ('GLOBAL', "全域座標", "使用全域座標"),
+        ],
+        default='LOCAL'
+    )
+    handle_mode: EnumProperty(
+        name="Bezier 控制柄",
+        description="Bezier 曲線控制柄的選取方式",
+        items=[
+            ('IGNORE', "不處理", "只選取控制點，控制柄維持原狀"),
+            ('FOLLOW', "跟隨控制點", "控制柄與其控制點一起選取"),
+            ('TEST', "個別判斷", "控制柄依各自的座標判斷是否選取"),
+        ],
+        default='IGNORE'
+    )
+    target: EnumProperty(
+        name="寫入",
+        description="選取結果寫入目前選取或具名的選取遮罩",
+        items=[
+            ('SELECTION', "目前選取", "直接改變目前的選取"),
+            ('MASK', "選取遮罩", "寫入具名的選取遮罩，目前選取不變"),
+        ],
+        default='SELECTION'
+    )
+    mask_name: StringProperty(
+        name="遮罩名稱",
+        default="遮罩"
+    )
+
+    def region_matrix(self, obj):
+        """物件區域座標轉換到條件座標的矩陣，區域座標模式下為 None"""
+        return obj.matrix_world if self.coord_mode == 'GLOBAL' else None
+
+    def select_region(self, context, query_for):
+        """對所有編輯中的物件套用區域選取
+
+        query_for(context, obj=None) 回傳 obj 使用的 RegionQuery，條件無效時回報警告並回傳 None。
+        """
+        # 檢查模式是否為編輯模式
+        if context.mode not in {'EDIT_MESH', 'EDIT_CURVE', 'EDIT_ARMATURE'}:
+            self.report({"WARNING"}, "此操作僅適用於編輯模式")
+            return {'CANCELLED'}
+
+        selected_objects = context.objects_in_mode
+        if not selected_objects:
+            self.report({"WARNING"}, "沒有選取任何物件")
+            return {'CANCELLED'}
+
+        # 條件依物件而定（物件包圍盒需換算到各物件的座標），先檢查條件是否有效
+        if query_for(context) is None:
+            return {'CANCELLED'}
+
+        if self.target == 'MASK' and not self.mask_name:
+            self.report({"WARNING"}, "請輸入遮罩名稱")
+            return {'CANCELLED'}
+
+        with batched_object_mode(context):
+            for obj in selected_objects:
+                if obj.type == 'MESH':
+                    self.process_mesh(obj, query_for(context, obj))
+                elif obj.type == 'CURVE':
+                    self.process_curve(obj, query_for(context, obj))
+                elif obj.type == 'ARMATURE':
+                    self.process_armature(obj, query_for(context, obj))
+                else:
+                    self.report({"INFO"}, f"目前不支援物件類型: {obj.type}")
+
+        self.report({"INFO"}, "區域選取完成")
+        return {'FINISHED'}
+
+    def store_result(self, obj, select):
+        """target 為遮罩時將結果存入遮罩並回傳 True，否則回傳 False 由呼叫端寫入選取"""
+        if self.target != 'MASK':
+            return False
+        with phase("write_back"):
+            store_mask(obj, self.mask_name, pack_mask(select), len(select))
+        return True
+
+    def process_mesh(self, obj, query):
+        """處理網格物件（需在物件模式下呼叫）"""
+        vert_select = mesh_region_mask(obj.data, query, self.region_matrix(obj))
+        if not self.store_result(obj, vert_select):
+            write_mesh_selection(obj.data, vert_select)
+
+    def process_curve(self, obj, query):
+        """處理曲線物件（需在物件模式下呼叫）"""
+        curve = obj.data
+        matrix = self.region_matrix(obj)
+
+        def point_mask(coords, hidden):
+            # 隱藏的控制點不會被選取
+            return query.mask(coords, matrix) & ~hidden
+
+        bezier_splines, other_splines = split_splines(curve)
+
+        with phase("extract"):
+            coords, offsets = gather_spline_points(bezier_splines, "bezier_points", "co", 3)
+            hidden, _ = gather_spline_points(bezier_splines, "bezier_points", "hide", 1, bool)
+            if self.handle_mode == 'TEST':
+                left, _ = gather_spline_points(bezier_splines, "bezier_points", "handle_left", 3)
+                right, _ = gather_spline_points(bezier_splines, "bezier_points", "handle_right", 3)
+            # NURBS/Poly 控制點為 (x, y, z, w)，w 為權重而非齊次座標的縮放，只取 xyz 判斷
+            other_coords, other_offsets = gather_spline_points(other_splines, "points", "co", 4)
+            other_hidden, _ = gather_spline_points(other_splines, "points", "hide", 1, bool)
+
+        with phase("compute"):
+            select = point_mask(coords, hidden)
+            if self.handle_mode == 'TEST':
+                select_left = point_mask(left, hidden)
+                select_right = point_mask(right, hidden)
+            elif self.handle_mode == 'FOLLOW':
+                select_left = select_right = select
+            other_select = point_mask(np.ascontiguousarray(other_coords[:, :3]), other_hidden)
+
+        if self.store_result(obj, np.concatenate((select, other_select))):
+            return
+
+        with phase("write_back"):
+            scatter_spline_points(bezier_splines, "bezier_points", "select_control_point", select, offsets)
+            if self.handle_mode != 'IGNORE':
+                scatter_spline_points(bezier_splines, "bezier_points", "select_left_handle", select_left, offsets)
+                scatter_spline_points(bezier_splines, "bezier_points", "select_right_handle", select_right, offsets)
+            scatter_spline_points(other_splines, "points", "select", other_select, other_offsets)
+
+    def process_armature(self, obj, query):
+        """處理骨架物件"""
+        bones = obj.data.edit_bones
+
+        # 一次讀取所有骨骼的 head、tail 與隱藏狀態
+        with phase("extract"):
+            heads = read_vectors(bones, "head")
+            tails = read_vectors(bones, "tail")
+            hidden = read_flags(bones, "hide")
+
+        with phase("compute"):
+            # 判斷骨骼的 head 和 tail 是否符合條件，隱藏的骨骼不選取
+            matrix = self.region_matrix(obj)
+            head_mask = query.mask(heads, matrix) & ~hidden
+            tail_mask = query.mask(tails, matrix) & ~hidden
+
+        if self.store_result(obj, head_mask | tail_mask):
+            return
+
+        # 根據條件選取骨骼
+        with phase("write_back"):
+            bones.foreach_set("select", head_mask | tail_mask)
+            bones.foreach_set("select_head", head_mask)
+            bones.foreach_set("select_tail", tail_mask)
+
+
+class OBJECT_OT_SelectVerticesByAxis(RegionSelectBase, bpy.types.Operator):
+    bl_idname = "object.select_vertices_by_axis"
+    bl_label = "依軸向選取"
+    bl_description = "依軸向選取頂點（支援網格、曲線與骨骼）"
+    bl_options = {"REGISTER", "UNDO"}
+
+    # 使用者設定屬性
+    x_axis: BoolProperty(
+        name="X軸",
+        description="是否根據 X 軸選取",
+        default=True
+    )
+    y_axis: BoolProperty(
+        name="Y軸",
+        description="是否根據 Y 軸選取",
+        default=False
+    )
+    z_axis: BoolProperty(
+        name="Z軸",
+        description="是否根據 Z 軸選取",
+        default=False
+    )
+    direction: EnumProperty(
+        name="方向選擇",
+        description="選取大於等於0或小於等於0的頂點",
+        items=[
+            ('POSITIVE', "大於等於0", "選取大於等於0的頂點"),
+            ('NEGATIVE', "小於等於0", "選取小於等於0的頂點"),
+        ],
+        default='POSITIVE'
+    )
+    action: EnumProperty(
+        name="選取方式",
+        description="依軸向選取，或選取目前選取頂點沿勾選軸向的鏡像頂點（僅網格）",
+        items=[
+            ('AXIS', "依軸向", "選取座標在軸向一側的元素"),
+            ('MIRROR', "鏡像", "改為選取目前選取頂點的鏡像頂點"),
+            ('MIRROR_EXTEND', "加入鏡像", "保留目前選取並加入其鏡像頂點"),
+        ],
+        default='AXIS'
+    )
+    mirror_tolerance: FloatProperty(
+        name="鏡像容許誤差",
+        description="鏡像位置與頂點的最大距離",
+        default=1e-4,
+        min=0.0,
+        precision=5
+    )
+
+    @profiled
+    def execute(self, context):
+        return self.select_region(context, self.region_query)
+
+    def region_query(self, context, obj=None):
+        axis_flags = (self.x_axis, self.y_axis, self.z_axis)
+        if not any(axis_flags):
+            self.report({"WARNING"}, "至少選擇一個軸向")
+            return None
+        return axis_query(axis_flags, self.direction == 'POSITIVE')
+
+    def process_mesh(self, obj, query):
+        if self.action == 'AXIS':
+            super().process_mesh(obj, query)
+            return
+
+        # 以快取的鏡像對應陣列一次轉換整個選取
+        mesh = obj.data
+        axes = [i for i, flag in enumerate((self.x_axis, self.y_axis, self.z_axis)) if flag]
+        with phase("mirror_map"):
+            mapping = mirror_map(obj, axes, self.mirror_tolerance)
+        with phase("extract"):
+            select = read_flags(mesh.vertices, "select")
+            hidden = read_flags(mesh.vertices, "hide")
+
+        with phase("compute"):
+            vert_select = select.copy() if self.action == 'MIRROR_EXTEND' else np.zeros(len(select), dtype=bool)
+            vert_select[mapping[select & (mapping >= 0)]] = True
+            vert_select &= ~hidden
+
+        if not self.store_result(obj, vert_select):
+            write_mesh_selection(mesh, vert_select)
+
+    def process_curve(self, obj, query):
+        if self.action == 'AXIS':
+            super().process_curve(obj, query)
+        else:
+            self.report({"INFO"}, "鏡像選取僅支援網格")
+
+    def process_armature(self, obj, query):
+        if self.action == 'AXIS':
+            super().process_armature(obj, query)
+        else:
+            self.report({"INFO"}, "鏡像選取僅支援網格")
+
+
+class SelectRegionItem(bpy.types.PropertyGroup):
+    """區域選取的單一條件"""
+    kind: EnumProperty(
+        name="類型",
+        items=[
+            ('PLANE', "平面", "法線 · 座標 >= 偏移的半空間"),
+            ('BOX', "方塊", "以中心與尺寸定義的軸向方塊"),
+            ('SPHERE', "球體", "以中心與半徑定義的球體"),
+            ('OBJECT', "物件包圍盒", "指定物件的包圍盒（隨物件旋轉縮放）"),
+        ],
+        default='PLANE'
+    )
+    invert: BoolProperty(
+        name="反轉",
+        description="選取條件以外的部分（NOT）",
+        default=False
+    )
+    group: IntProperty(
+        name="群組",
+        description="同一群組的條件先以組合方式結合，各群組再以群組組合方式結合",
+        min=0,
+        default=0
+    )
+    normal: FloatVectorProperty(
+        name="法線",
+        size=3,
+        default=(1.0, 0.0, 0.0)
+    )
+    offset: FloatProperty(
+        name="偏移",
+        default=0.0
+    )
+    center: FloatVectorProperty(
+        name="中心",
+        size=3,
+        subtype='TRANSLATION',
+        default=(0.0, 0.0, 0.0)
+    )
+    size: FloatVectorProperty(
+        name="尺寸",
+        size=3,
+        subtype='XYZ',
+        min=0.0,
+        default=(2.0, 2.0, 2.0)
+    )
+    radius: FloatProperty(
+        name="半徑",
+        min=0.0,
+        default=1.0
+    )
+    object_name: StringProperty(
+        name="物件",
+        description="以此物件的包圍盒作為區域"
+    )
+
+    def predicate(self, to_world):
+        """建立條件，to_world 為條件座標轉換到全域座標的矩陣（物件包圍盒使用）"""
+        if self.kind == 'PLANE':
+            return PlanePredicate(self.normal, self.offset, self.invert)
+        if self.kind == 'BOX':
+            half = np.array(self.size) / 2
+            return BoxPredicate(np.array(self.center) - half, np.array(self.center) + half, self.invert)
+        if self.kind == 'SPHERE':
+            return SpherePredicate(self.center, self.radius, self.invert)
+        return BoundsPredicate.from_object(bpy.data.objects[self.object_name], to_world, self.invert)
+
+
+class OBJECT_OT_SelectVerticesByRegion(RegionSelectBase, bpy.types.Operator):
+    bl_idname = "object.select_vertices_by_region"
+    bl_label = "依區域選取"
+    bl_description = "以平面、方塊、球體與物件包圍盒組合的區域選取頂點（支援網格、曲線與骨骼）；條件可分群組做一層巢狀組合，反轉只套用在單一條件"
+    bl_options = {"REGISTER", "UNDO"}
+
+    regions: CollectionProperty(type=SelectRegionItem)
+    combine: EnumProperty(
+        name="組合方式",
+        description="多個條件的組合方式",
+        items=[
+            ('ALL', "全部符合 (AND)", "符合所有條件的元素"),
+            ('ANY', "任一符合 (OR)", "符合任一條件的元素"),
+        ],
+        default='ALL'
+    )
+    group_combine: EnumProperty(
+        name="群組組合方式",
+        description="多個群組的組合方式",
+        items=[
+            ('ALL', "全部符合 (AND)", "符合所有群組的元素"),
+            ('ANY', "任一符合 (OR)", "符合任一群組的元素"),
+        ],
+        default='ANY'
+    )
+
+    @profiled
+    def execute(self, context):
+        return self.select_region(context, self.region_query)
+
+    def region_query(self, context, obj=None):
+        if not self.regions:
+            self.report({"WARNING"}, "至少需要一個區域條件")
+            return None
+        for item in self.regions:
+            if item.kind == 'OBJECT' and item.object_name not in bpy.data.objects:
+                self.report({"WARNING"}, f"找不到物件: {item.object_name}")
+                return None
+        # 物件包圍盒需知道條件座標與全域座標的關係
+        to_world = obj.matrix_world if obj is not None and self.coord_mode == 'LOCAL' else None
+        groups = {}
+        for item in self.regions:
+            groups.setdefault(item.group, []).append(item.predicate(to_world))
+        queries = [RegionQuery(predicates, self.combine) for _, predicates in sorted(groups.items())]
+        return queries[0] if len(queries) == 1 else RegionQuery(queries, self.group_combine)
+
+    def invoke(self, context, event):
+        # 從選單呼叫時提供一個預設條件，可在重做面板調整
+        if not self.regions:
+            self.regions.add()
+        return self.execute(context)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "combine")
+        if len({item.group for item in self.regions}) > 1:
+            layout.prop(self, "group_combine")
+        layout.prop(self, "coord_mode")
+        layout.prop(self, "handle_mode")
+        layout.prop(self, "target")
+        if self.target == 'MASK':
+            layout.prop(self, "mask_name")
+        for item in self.regions:
+            box = layout.box()
+            row = box.row()
+            row.prop(item, "kind", text="")
+            row.prop(item, "group")
+            row.prop(item, "invert")
+            if item.kind == 'PLANE':
+                box.prop(item, "normal")
+                box.prop(item, "offset")
+            elif item.kind == 'BOX':
+                box.prop(item, "center")
+                box.prop(item, "size")
+            elif item.kind == 'SPHERE':
+                box.prop(item, "center")
+                box.prop(item, "radius")
+            else:
+                box.prop_search(item, "object_name", bpy.data, "objects")
+
+
+class ThresholdIndex:
+    """單一網格物件沿某方向的投影排序索引
+
+    invoke 時排序一次，之後門檻移動只需以二分搜尋找出新舊門檻之間的頂點並切換其選取狀態。
+    """
+    __slots__ = ("obj", "bm", "order", "values", "select", "original", "position")
+
+    def __init__(self, obj, direction, offset):
+        self.obj = obj
+        mesh = obj.data
+        # 讓網格資料與編輯中的 bmesh 同步，頂點順序與 bmesh 索引一致
+        coords = mesh_coordinates(obj)
+        hidden = read_flags(mesh.vertices, "hide")
+        select = read_flags(mesh.vertices, "select")
+
+        projected = coords @ direction + offset
+        # 隱藏的頂點不列入索引，永遠不會被切換
+        visible = np.flatnonzero(~hidden)
+        self.order = visible[np.argsort(projected[visible], kind='stable')]
+        self.values = projected[self.order]
+        self.select = select
+        self.original = select.copy()
+        self.position = None
+
+        self.bm = bmesh.from_edit_mesh(mesh)
+        self.bm.verts.ensure_lookup_table()
+
+    def split(self, threshold, is_positive):
+        """回傳門檻在排序索引中的位置，is_positive 時位置之後為選取，否則之前為選取"""
+        return int(np.searchsorted(self.values, threshold, side='left' if is_positive else 'right'))
+
+    def flip(self, indices, state):
+        """切換指定頂點的選取狀態，只處理實際改變的頂點
+
+        BMesh 沒有批次寫入，以 map 在 C 中迭代設定 select（等同 select_set），不經過 Python 迴圈主體。
+        """
+        indices = indices[self.select[indices] != state]
+        verts = map(self.bm.verts.__getitem__, indices.tolist())
+        collections.deque(map(setattr, verts, itertools.repeat("select"), itertools.repeat(state)), maxlen=0)
+        self.select[indices] = state
+        return len(indices)
+
+    def apply(self, threshold, is_positive):
+        """將選取更新為門檻對應的狀態，回傳切換的頂點數"""
+        position = self.split(threshold, is_positive)
+        if self.position is None:
+            # 第一次套用：取代原本的選取，隱藏頂點以外全部比對
+            inside = self.order[position:] if is_positive else self.order[:position]
+            outside = self.order[:position] if is_positive else self.order[position:]
+            changed = self.flip(inside, True) + self.flip(outside, False)
+        elif position == self.position:
+            return 0
+        else:
+            # 只切換新舊門檻之間的頂點
+            low, high = sorted((self.position, position))
+            grow = position < self.position if is_positive else position > self.position
+            changed = self.flip(self.order[low:high], grow)
+        self.position = position
+        if changed:
+            bmesh.update_edit_mesh(self.obj.data, loop_triangles=False, destructive=False)
+        return changed
+
+    def selected_count(self, is_positive):
+        return len(self.order) - self.position if is_positive else self.position
+
+    def restore(self):
+        """還原 invoke 前的選取"""
+        changed = np.flatnonzero(self.select != self.original)
+        if not len(changed):
+            return
+        self.flip(changed[self.original[changed]], True)
+        self.flip(changed[~self.original[changed]], False)
+        bmesh.update_edit_mesh(self.obj.data, loop_triangles=False, destructive=False)
+
+    def finish(self):
+        """依選取模式更新邊與面的選取，選取沒有改變時不需更新"""
+        if np.array_equal(self.select, self.original):
+            return
+        self.bm.select_flush_mode()
+        bmesh.update_edit_mesh(self.obj.data, loop_triangles=False, destructive=False)
+
+
+class OBJECT_OT_SelectVerticesByThreshold(bpy.types.Operator):
+    bl_idname = "object.select_vertices_by_threshold"
+    bl_label = "依門檻平面選取"
+    bl_description = "拖曳滑鼠沿軸向或任意方向移動門檻平面，即時選取平面一側的頂點（僅支援網格）"
+    bl_options = {"REGISTER", "UNDO", "BLOCKING", "GRAB_CURSOR"}
+
+    axis: EnumProperty(
+        name="方向",
+        description="門檻平面的法線方向",
+        items=[
+            ('X', "X軸", "沿 X 軸"),
+            ('Y', "Y軸", "沿 Y 軸"),
+            ('Z', "Z軸", "沿 Z 軸"),
+            ('VIEW', "視角", "沿目前視角的前後方向（全域座標）"),
+            ('CUSTOM', "自訂", "沿自訂方向"),
+        ],
+        default='X'
+    )
+    custom_direction: FloatVectorProperty(
+        name="自訂方向",
+        description="方向為自訂時使用的法線向量",
+        subtype='DIRECTION',
+        size=3,
+        default=(1.0, 0.0, 0.0)
+    )
+    threshold: FloatProperty(
+        name="門檻",
+        description="門檻平面沿方向的位置",
+        default=0.0
+    )
+    direction: EnumProperty(
+        name="方向選擇",
+        description="選取門檻平面哪一側的頂點",
+        items=[
+            ('POSITIVE', "大於等於門檻", "選取投影大於等於門檻的頂點"),
+            ('NEGATIVE', "小於等於門檻", "選取投影小於等於門檻的頂點"),
+        ],
+        default='POSITIVE'
+    )
+    coord_mode: EnumProperty(
+        name="座標模式",
+        description="選擇座標系統模式",
+        items=[
+            ('LOCAL', "區域座標", "使用區域座標"),
+            ('GLOBAL', "全域座標", "使用全域座標"),
+        ],
+        default='LOCAL'
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'EDIT_MESH'
+
+    def normal(self, context):
+        """回傳門檻平面的單位法線，無效時回傳 None"""
+        if self.axis == 'VIEW':
+            region_3d = context.region_data
+            if region_3d is None:
+                return None
+            vector = np.array(region_3d.view_rotation @ Vector((0.0, 0.0, -1.0)))
+        elif self.axis == 'CUSTOM':
+            vector = np.array(self.custom_direction, dtype=np.float64)
+        else:
+            vector = np.eye(3)["XYZ".index(self.axis)]
+        length = np.linalg.norm(vector)
+        return vector / length if length > 1e-12 else None
+
+    def build_indices(self, context, normal):
+        """為每個編輯中的網格物件建立投影排序索引"""
+        # 視角方向固定為全域座標
+        use_global = self.coord_mode == 'GLOBAL' or self.axis == 'VIEW'
+        indices = []
+        for obj in context.objects_in_mode:
+            if obj.type != 'MESH':
+                continue
+            if use_global:
+                # 投影 (M @ co) · n 等於 co · (M3ᵀ n) + t · n，不需轉換每個頂點
+                matrix = np.array(obj.matrix_world, dtype=np.float64)
+                direction = matrix[:3, :3].T @ normal
+                offset = float(matrix[:3, 3] @ normal)
+            else:
+                direction, offset = normal, 0.0
+            indices.append(ThresholdIndex(obj, direction.astype(np.float32), offset))
+        return indices
+
+    def apply(self):
+        is_positive = self.direction == 'POSITIVE'
+        for index in self._indices:
+            index.apply(self.threshold, is_positive)
+
+    def finish(self):
+        for index in self._indices:
+            index.finish()
+        self._indices = None
+
+    @profiled
+    def execute(self, context):
+        # 重做面板變更參數時以最終門檻重新選取
+        normal = self.normal(context)
+        if normal is None:
+            self.report({"WARNING"}, "方向向量無效")
+            return {'CANCELLED'}
+        with phase("extract"):
+            self._indices = self.build_indices(context, normal)
+        with phase("write_back"):
+            self.apply()
+            self.finish()
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        normal = self.normal(context)
+        if normal is None:
+            self.report({"WARNING"}, "方向向量無效")
+            return {'CANCELLED'}
+        self._indices = self.build_indices(context, normal)
+        if not self._indices:
+            self.report({"WARNING"}, "沒有編輯中的網格物件")
+            return {'CANCELLED'}
+
+        self.calibrate(context, event)
+        self.apply()
+        self.update_header(context)
+        context.window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'MOUSEMOVE':
+            scale = 0.1 if event.shift else 1.0
+            self.threshold = self._start_threshold + (event.mouse_x - self._start_x) * self._units_per_pixel * scale
+            self.apply()
+            self.update_header(context)
+        elif event.type in {'LEFTMOUSE', 'RET', 'NUMPAD_ENTER'} and event.value == 'PRESS':
+            context.area.header_text_set(None)
+            self.finish()
+            return {'FINISHED'}
+        elif event.type in {'RIGHTMOUSE', 'ESC'} and event.value == 'PRESS':
+            context.area.header_text_set(None)
+            for index in self._indices:
+                index.restore()
+            self._indices = None
+            return {'CANCELLED'}
+        elif event.type in {'X', 'Y', 'Z'} and event.value == 'PRESS':
+            # 切換軸向需重建排序索引
+            for index in self._indices:
+                index.restore()
+            self.axis = event.type
+            self._indices = self.build_indices(context, self.normal(context))
+            # 新軸向的投影範圍不同，重新換算滑鼠移動量
+            self.calibrate(context, event)
+            self.apply()
+            self.update_header(context)
+        elif event.type == 'F' and event.value == 'PRESS':
+            # 翻轉選取的一側，排序索引不變，只需重新比對
+            self.direction = 'NEGATIVE' if self.direction == 'POSITIVE' else 'POSITIVE'
+            for index in self._indices:
+                index.position = None
+            self.apply()
+            self.update_header(context)
+        return {'RUNNING_MODAL'}
+
+    def calibrate(self, context, event):
+        """以目前滑鼠位置與門檻為起點，滑鼠橫向移動一個區域寬度約等於所有頂點投影範圍"""
+        values = [index.values for index in self._indices if len(index.values)]
+        low = min((float(v[0]) for v in values), default=0.0)
+        high = max((float(v[-1]) for v in values), default=0.0)
+        self._units_per_pixel = max(high - low, 1e-6) / max(context.region.width, 1)
+        self._start_x = event.mouse_x
+        self._start_threshold = self.threshold
+
+    def update_header(self, context):
+        is_positive = self.direction == 'POSITIVE'
+        count = sum(index.selected_count(is_positive) for index in self._indices)
+        side = ">=" if is_positive else "<="
+        context.area.header_text_set(
+            f"門檻 {side} {self.threshold:.4f}  已選取 {count} 個頂點  (X/Y/Z 切換軸向, F 翻轉, Shift 微調)"
+        )
+
+
+class OBJECT_OT_SelectionMask(bpy.types.Operator):
+    bl_idname = "object.vertex_selection_mask"
+    bl_label = "選取遮罩"
+    bl_description = "將選取儲存為具名遮罩、由遮罩還原選取，或在遮罩之間做聯集/交集/差集（支援網格、曲線與骨骼）"
+    bl_options = {"REGISTER", "UNDO"}
+
+    action: EnumProperty(
+        name="動作",
+        items=[
+            ('SAVE', "儲存選取", "以目前選取更新遮罩"),
+            ('RESTORE', "還原選取", "以遮罩更新目前選取"),
+            ('COMBINE', "遮罩運算", "以另一個遮罩更新遮罩"),
+            ('DELETE', "刪除遮罩", "刪除遮罩"),
+        ],
+        default='SAVE'
+    )
+    operation: EnumProperty(
+        name="運算",
+        description="結果 = 目標 (運算) 來源",
+        items=[
+            ('SET', "取代", "以來源取代目標"),
+            ('UNION', "聯集", "目標或來源"),
+            ('INTERSECT', "交集", "目標且來源"),
+            ('SUBTRACT', "差集", "目標且非來源"),
+        ],
+        default='SET'
+    )
+    mask_name: StringProperty(
+        name="遮罩名稱",
+        default="遮罩"
+    )
+    other_name: StringProperty(
+        name="來源遮罩",
+        description="遮罩運算時作為來源的遮罩"
+    )
+
+    @profiled
+    def execute(self, context):
+        if context.mode not in {'EDIT_MESH', 'EDIT_CURVE', 'EDIT_ARMATURE'}:
+            self.report({"WARNING"}, "此操作僅適用於編輯模式")
+            return {'CANCELLED'}
+        if not self.mask_name:
+            self.report({"WARNING"}, "請輸入遮罩名稱")
+            return {'CANCELLED'}
+
+        objects = [obj for obj in context.objects_in_mode if obj.type in {'MESH', 'CURVE', 'ARMATURE'}]
+        operation = MASK_OPERATIONS[self.operation]
+        skipped = []
+
+        # 只有讀寫選取時需要物件模式，遮罩之間的運算只動到 ID 屬性
+        with batched_object_mode(context, enabled=self.action in {'SAVE', 'RESTORE'}):
+            for obj in objects:
+                if self.action == 'DELETE':
+                    delete_mask(obj, self.mask_name)
+                    continue
+
+                stored = load_mask(obj, self.mask_name)
+                if self.action == 'COMBINE':
+                    source = load_mask(obj, self.other_name)
+                    if source is None or (stored is not None and stored[1] != source[1]):
+                        skipped.append(obj.name)
+                        continue
+                    destination = stored[0] if stored is not None else np.zeros_like(source[0])
+                    store_mask(obj, self.mask_name, operation(destination, source[0]), source[1])
+                    continue
+
+                with phase("extract"):
+                    select = read_selection(obj)
+                # 元素數量改變（例如新增或刪除頂點）的遮罩無法對應
+                if stored is not None and stored[1] != len(select):
+                    skipped.append(obj.name)
+                    continue
+
+                with phase("compute"):
+                    current = pack_mask(select)
+                    if self.action == 'SAVE':
+                        destination = stored[0] if stored is not None else np.zeros_like(current)
+                        result = operation(destination, current)
+                    elif stored is not None:
+                        result = operation(current, stored[0])
+                    else:
+                        skipped.append(obj.name)
+                        continue
+
+                with phase("write_back"):
+                    if self.action == 'SAVE':
+                        store_mask(obj, self.mask_name, result, len(select))
+                    else:
+                        write_selection(obj, unpack_mask(result, len(select)))
+
+        if skipped:
+            self.report({"WARNING"}, f"遮罩不存在或元素數量不符，略過: {', '.join(skipped)}")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "action")
+        if self.action != 'DELETE':
+            layout.prop(self, "operation")
+        layout.prop(self, "mask_name")
+        if self.action == 'COMBINE':
+            layout.prop(self, "other_name")
+
+        obj = context.object
+        names = mask_names(obj) if obj is not None and obj.data is not None else []
+        if names:
+            box = layout.box()
+            box.label(text="目前物件的遮罩:")
+            for name in names:
+                box.label(text=name)
+
+
+# 定義功能加入選單
+def menu_func(self, context):
+    self.layout.operator(OBJECT_OT_SelectVerticesByAxis.bl_idname, text="依軸向選取")
+    self.layout.operator(OBJECT_OT_SelectVerticesByRegion.bl_idname, text="依區域選取")
+    self.layout.operator(OBJECT_OT_SelectionMask.bl_idname, text="選取遮罩")
+
+
+def menu_func_mesh(self, context):
+    self.layout.operator(OBJECT_OT_SelectVerticesByThreshold.bl_idname, text="依門檻平面選取")
+
+# 註冊類別清單
+classes = [
+    SelectRegionItem,
+    OBJECT_OT_SelectVerticesByAxis,
+    OBJECT_OT_SelectVerticesByRegion,
+    OBJECT_OT_SelectVerticesByThreshold,
+    OBJECT_OT_SelectionMask,
+]
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.VIEW3D_MT_select_edit_mesh.append(menu_func)  # 加入網格選單
+    bpy.types.VIEW3D_MT_select_edit_mesh.append(menu_func_mesh)
+    bpy.types.VIEW3D_MT_select_edit_curve.append(menu_func)  # 加入曲線選單
+    bpy.types.VIEW3D_MT_select_edit_armature.append(menu_func)  # 加入骨架選單
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    bpy.types.VIEW3D_MT_select_edit_mesh.remove(menu_func)
+    bpy.types.VIEW3D_MT_select_edit_mesh.remove(menu_func_mesh)
+    bpy.types.VIEW3D_MT_select_edit_curve.remove(menu_func)
+    bpy.types.VIEW3D_MT_select_edit_armature.remove(menu_func)
@@ -0,0 +1,88 @@
+"""快取網格頂點沿軸向的鏡像對應，供鏡像權重與鏡像選取使用"""
+import bmesh
+import bpy
+
+from .延遲匯入 import kdtree, np
+from .資料存取 import mesh_coordinates, register_cache, unregister_cache
+
+DEFAULT_TOLERANCE = 1e-4
+
+# (網格資料, 鏡像軸, 容許誤差) -> (拓撲簽章, 對應陣列)
+_mirror_maps = {}
+
+
+def topology_signature(obj):
+    """回傳網格的頂點/邊/面數量，數量改變時視為拓撲變更"""
+    if obj.mode == 'EDIT':
+        bm = bmesh.from_edit_mesh(obj.data)
+        return len(bm.verts), len(bm.edges), len(bm.faces)
+    mesh = obj.data
+    return len(mesh.vertices), len(mesh.edges), len(mesh.polygons)
+
+
+def build_mirror_map(coords, axes, tolerance):
+    """以 KD 樹找出每個頂點沿 axes 鏡像後距離 tolerance 內最近的頂點，找不到時為 -1"""
+    tree = kdtree.KDTree(len(coords))
+    for index, co in enumerate(coords.tolist()):
+        tree.insert(co, index)
+    tree.balance()
+
+    mirrored = coords.copy()
+    mirrored[:, list(axes)] *= -1
+    mapping = np.full(len(coords), -1, dtype=np.int32)
+    for index, co in enumerate(mirrored.tolist()):
+        _, found, distance = tree.find(co)
+        if found is not None and distance <= tolerance:
+            mapping[index] = found
+    return mapping
+
+
+def mirror_map(obj, axes=(0,), tolerance=DEFAULT_TOLERANCE):
+    """回傳 int32 陣列，第 i 個元素為頂點 i 的鏡像頂點索引（找不到時為 -1）
+
+    對應陣列依網格快取，只有頂點/邊/面數量改變時才重建；只移動頂點不會自動重建，
+    需要時可呼叫 invalidate_mirror_maps()。
+    """
+    key = (obj.data.as_pointer(), tuple(sorted(axes)), float(tolerance))
+    signature = topology_signature(obj)
+    cached = _mirror_maps.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    mapping = build_mirror_map(mesh_coordinates(obj), key[1], tolerance)
+    _mirror_maps[key] = (signature, mapping)
+    return mapping
+
+
+def invalidate_mirror_maps(obj=None):
+    """清除指定物件（或全部）的鏡像對應"""
+    if obj is None:
+        _mirror_maps.clear()
+        return
+    pointer = obj.data.as_pointer()
+    for key in [key for key in _mirror_maps if key[0] == pointer]:
+        del _mirror_maps[key]
+
+
+def mirror_group_indices(obj):
+    """回傳每個頂點群組對應的鏡像群組索引（左右名稱互換），沒有對應群組時為自己"""
+    vertex_groups = obj.vertex_groups
+    mapping = np.arange(len(vertex_groups), dtype=np.int32)
+    for group in vertex_groups:
+        flipped = vertex_groups.get(bpy.utils.flip_name(group.name))
+        if flipped is not None:
+            mapping[group.index] = flipped.index
+    return mapping
+
+
+def unique_pairs(source, target):
+    """多個頂點對應到同一個鏡像頂點時只保留第一組"""
+    target, first = np.unique(target, return_index=True)
+    return source[first], target
+
+
+def register():
+    register_cache(invalidate_mirror_maps)
+
+
+def unregister():
+    unregister_cache(invalidate_mirror_maps)